@@ -23,6 +23,7 @@ from rothc import (
     DataHandler,
     ModelRunner,
 )
+from rothc.data_structures import POOL_DPM, POOL_RPM, POOL_BIO, POOL_HUM
 
 
 def example_1_basic_simulation():
@@ -52,7 +53,7 @@ def example_1_basic_simulation():
     )
     
     print(f"Completed {len(month_results)} monthly timesteps")
-    print(f"Final SOC: {pools.SOC[0]:.4f} t C/ha\n")
+    print(f"Final SOC: {pools.SOC:.4f} t C/ha\n")
 
 
 def example_2_custom_rate_modifiers():
@@ -75,7 +76,7 @@ def example_2_custom_rate_modifiers():
     
     # Test moisture factor
     soil = SoilProperties(clay=23.4, depth=25.0)
-    soil_water_deficit = [0.0]
+    soil_water_deficit = 0.0
     
     print("Moisture Rate Modifying Factors:")
     print("-" * 40)
@@ -86,8 +87,8 @@ def example_2_custom_rate_modifiers():
     ]
     
     for name, rain, evap in scenarios:
-        factor = rm.calculate_moisture_factor(
-            rain, evap, soil, plant_cover=1, soil_water_deficit=soil_water_deficit.copy()
+        factor, _ = rm.calculate_moisture_factor(
+            rain, evap, soil, plant_cover=1, soil_water_deficit=soil_water_deficit
         )
         print(f"  {name:15s}: {factor:.4f}")
     print()
@@ -124,32 +125,33 @@ def example_3_single_timestep():
     
     # Initialize pools with some carbon
     pools = CarbonPools(
-        DPM=[0.5], RPM=[2.0], BIO=[1.0], HUM=[10.0], IOM=[1.5], SOC=[0.0],
-        DPM_Rage=[0.0], RPM_Rage=[0.0], BIO_Rage=[0.0], 
-        HUM_Rage=[0.0], IOM_Rage=[50000.0], Total_Rage=[0.0]
+        DPM=0.5, RPM=2.0, BIO=1.0, HUM=10.0, IOM=1.5, SOC=0.0,
+        DPM_Rage=0.0, RPM_Rage=0.0, BIO_Rage=0.0, 
+        HUM_Rage=0.0, IOM_Rage=50000.0, Total_Rage=0.0
     )
     pools.update_total_soc()
     
-    print(f"Initial SOC: {pools.SOC[0]:.4f} t C/ha")
-    print(f"  DPM: {pools.DPM[0]:.4f}")
-    print(f"  RPM: {pools.RPM[0]:.4f}")
-    print(f"  BIO: {pools.BIO[0]:.4f}")
-    print(f"  HUM: {pools.HUM[0]:.4f}")
-    print(f"  IOM: {pools.IOM[0]:.4f}")
+    print(f"Initial SOC: {pools.SOC:.4f} t C/ha")
+    print(f"  DPM: {pools.DPM:.4f}")
+    print(f"  RPM: {pools.RPM:.4f}")
+    print(f"  BIO: {pools.BIO:.4f}")
+    print(f"  HUM: {pools.HUM:.4f}")
+    print(f"  IOM: {pools.IOM:.4f}")
     print()
     
     # Run one timestep
-    soil_water_deficit = [0.0]
-    model.run_timestep(pools, climate, inputs, soil, soil_water_deficit)
+    soil_water_deficit = 0.0
+    soil_water_deficit = model.run_timestep(pools, climate, inputs, soil,
+                                            soil_water_deficit)
     
     print(f"After 1 month:")
-    print(f"Final SOC: {pools.SOC[0]:.4f} t C/ha")
-    print(f"  DPM: {pools.DPM[0]:.4f}")
-    print(f"  RPM: {pools.RPM[0]:.4f}")
-    print(f"  BIO: {pools.BIO[0]:.4f}")
-    print(f"  HUM: {pools.HUM[0]:.4f}")
-    print(f"  IOM: {pools.IOM[0]:.4f}")
-    print(f"Change: {pools.SOC[0] - 15.0:+.4f} t C/ha\n")
+    print(f"Final SOC: {pools.SOC:.4f} t C/ha")
+    print(f"  DPM: {pools.DPM:.4f}")
+    print(f"  RPM: {pools.RPM:.4f}")
+    print(f"  BIO: {pools.BIO:.4f}")
+    print(f"  HUM: {pools.HUM:.4f}")
+    print(f"  IOM: {pools.IOM:.4f}")
+    print(f"Change: {pools.SOC - 15.0:+.4f} t C/ha\n")
 
 
 def example_4_decomposition_details():
@@ -164,36 +166,37 @@ def example_4_decomposition_details():
     
     # Initialize pools
     pools = CarbonPools(
-        DPM=[1.0], RPM=[3.0], BIO=[1.5], HUM=[8.0], IOM=[1.5], SOC=[0.0],
-        DPM_Rage=[0.0], RPM_Rage=[0.0], BIO_Rage=[0.0], 
-        HUM_Rage=[0.0], IOM_Rage=[50000.0], Total_Rage=[0.0]
+        DPM=1.0, RPM=3.0, BIO=1.5, HUM=8.0, IOM=1.5, SOC=0.0,
+        DPM_Rage=0.0, RPM_Rage=0.0, BIO_Rage=0.0, 
+        HUM_Rage=0.0, IOM_Rage=50000.0, Total_Rage=0.0
     )
     
     # Calculate decomposition amounts
     rate_modifier = 1.0  # No environmental constraints
-    decomposed = decomp._calculate_decomposition(pools, rate_modifier)
+    remaining, decomposed = decomp._calculate_decomposition(pools, rate_modifier)
     
     print("Decomposition amounts (1 month with rate modifier = 1.0):")
     print("-" * 60)
-    print(f"  DPM: {pools.DPM[0]:.4f} → {decomposed['DPM_remaining']:.4f} "
-          f"(decomposed: {decomposed['DPM']:.4f})")
-    print(f"  RPM: {pools.RPM[0]:.4f} → {decomposed['RPM_remaining']:.4f} "
-          f"(decomposed: {decomposed['RPM']:.4f})")
-    print(f"  BIO: {pools.BIO[0]:.4f} → {decomposed['BIO_remaining']:.4f} "
-          f"(decomposed: {decomposed['BIO']:.4f})")
-    print(f"  HUM: {pools.HUM[0]:.4f} → {decomposed['HUM_remaining']:.4f} "
-          f"(decomposed: {decomposed['HUM']:.4f})")
+    print(f"  DPM: {pools.DPM:.4f} → {remaining[POOL_DPM]:.4f} "
+          f"(decomposed: {decomposed[POOL_DPM]:.4f})")
+    print(f"  RPM: {pools.RPM:.4f} → {remaining[POOL_RPM]:.4f} "
+          f"(decomposed: {decomposed[POOL_RPM]:.4f})")
+    print(f"  BIO: {pools.BIO:.4f} → {remaining[POOL_BIO]:.4f} "
+          f"(decomposed: {decomposed[POOL_BIO]:.4f})")
+    print(f"  HUM: {pools.HUM:.4f} → {remaining[POOL_HUM]:.4f} "
+          f"(decomposed: {decomposed[POOL_HUM]:.4f})")
     print()
     
     # Show redistribution
     soil = SoilProperties(clay=23.4, depth=25.0)
-    redistributed = decomp._redistribute_carbon(decomposed, soil.clay)
+    to_bio, to_hum = decomp._redistribute_carbon(decomposed, soil)
+    to_co2 = decomposed - to_bio - to_hum
     
     print("Redistribution of decomposed DPM:")
     print("-" * 60)
-    print(f"  To CO2: {redistributed['DPM']['CO2']:.4f} t C/ha")
-    print(f"  To BIO: {redistributed['DPM']['BIO']:.4f} t C/ha")
-    print(f"  To HUM: {redistributed['DPM']['HUM']:.4f} t C/ha")
+    print(f"  To CO2: {to_co2[POOL_DPM]:.4f} t C/ha")
+    print(f"  To BIO: {to_bio[POOL_DPM]:.4f} t C/ha")
+    print(f"  To HUM: {to_hum[POOL_DPM]:.4f} t C/ha")
     print()
 
 
@@ -0,0 +1,778 @@
+"""
+Compiled kernels for the RothC timestep, equilibrium and simulation loops.
+
+The functions in this module work on plain floats and NumPy arrays only, so
+that they can be compiled with Numba. If Numba is not installed they run as
+ordinary (slower) Python functions with identical results.
+"""
+
+import math
+from functools import lru_cache
+
+import numpy as np
+
+from .constants import ModelConstants
+from .data_structures import (
+    POOL_DPM, POOL_RPM, POOL_BIO, POOL_HUM, POOL_IOM, POOL_SOC,
+    POOL_DPM_RAGE, POOL_RPM_RAGE, POOL_BIO_RAGE, POOL_HUM_RAGE,
+    POOL_IOM_RAGE, POOL_TOTAL_RAGE
+)
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - exercised only without numba
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Fallback decorator used when Numba is unavailable."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+# Constants are bound at module level so Numba treats them as literals
+_DPM_K = ModelConstants.DPM_DECOMP_RATE
+_RPM_K = ModelConstants.RPM_DECOMP_RATE
+_BIO_K = ModelConstants.BIO_DECOMP_RATE
+_HUM_K = ModelConstants.HUM_DECOMP_RATE
+_FYM_TO_DPM = ModelConstants.FYM_TO_DPM
+_FYM_TO_RPM = ModelConstants.FYM_TO_RPM
+_FYM_TO_HUM = ModelConstants.FYM_TO_HUM
+_RMF_MAX = ModelConstants.RMF_MOISTURE_MAX
+_RMF_MIN = ModelConstants.RMF_MOISTURE_MIN
+_RMF_BARE = ModelConstants.RMF_PLANT_COVER_BARE
+_RMF_VEGETATED = ModelConstants.RMF_PLANT_COVER_VEGETATED
+_ZERO_THRESHOLD = ModelConstants.ZERO_THRESHOLD
+_DELTA14C_MEAN_LIFE = ModelConstants.DELTA14C_MEAN_LIFE
+
+# Smallest second difference, relative to the first differences, for which
+# the spin-up extrapolates a value; below it the extrapolation is dominated
+# by rounding and the value is left as cycled
+_AITKEN_GUARD = 1e-6
+
+
+@njit(cache=True)
+def _temperature_factor(temp):
+    """
+    Rate modifying factor for temperature.
+
+    Written without data-dependent branches: the factor is evaluated at
+    ``max(temp, -5)`` and masked to zero below -5 °C.
+    """
+    return ((temp >= -5.0) * 47.91 /
+            (math.exp(106.06 / (max(temp, -5.0) + 18.27)) + 1.0))
+
+
+@njit(cache=True)
+def _moisture_factor(rain, evap, PC, SMDMaxAdj, SMD1bar, SMDBare, swd):
+    """
+    Rate modifying factor for soil moisture.
+
+    The soil moisture deficit thresholds are those precomputed on
+    ``SoilProperties`` (``smd_max_adj``, ``smd_1bar``, ``smd_bare``).
+    Both plant cover cases and both moisture regimes are evaluated and
+    then selected, so the function compiles to branch-free code.
+
+    Returns:
+        Tuple of (moisture rate modifier, updated soil water deficit)
+    """
+    min_swc_df = swd + rain - 0.75 * evap
+    min_swc_df = min_swc_df if min_swc_df < 0.0 else 0.0
+    min_smd_bare_swc = SMDBare if SMDBare < swd else swd
+    swd_vegetated = SMDMaxAdj if SMDMaxAdj > min_swc_df else min_swc_df
+    swd_bare = (min_smd_bare_swc if min_smd_bare_swc > min_swc_df
+                else min_swc_df)
+    swd = swd_vegetated if PC == 1 else swd_bare
+
+    rm_dry = (_RMF_MIN + (_RMF_MAX - _RMF_MIN) *
+              (SMDMaxAdj - swd) / (SMDMaxAdj - SMD1bar))
+    return (_RMF_MAX if swd > SMD1bar else rm_dry), swd
+
+
+@njit(cache=True)
+def _plant_cover_factor(PC):
+    """Rate modifying factor for plant cover."""
+    return _RMF_BARE if PC == 0 else _RMF_VEGETATED
+
+
+@njit(cache=True)
+def _step(DPM, RPM, BIO, HUM, IOM, DPM_R, RPM_R, BIO_R, HUM_R, IOM_R,
+          temp, rain, evap, plant_to_dpm, plant_to_rpm, fym_to_dpm,
+          fym_to_rpm, fym_to_hum, PC, mod,
+          smd_max_adj, smd_1bar, smd_bare, bio_frac, hum_frac,
+          swd, exc, conr, dt):
+    """
+    Advance all pools by one timestep.
+
+    This is the scalar equivalent of ``RothCModel.run_timestep``. The
+    carbon inputs are given split between the pools, as by
+    ``_split_inputs`` or ``CarbonInputs``.
+
+    Returns:
+        Tuple of (DPM, RPM, BIO, HUM, SOC, DPM_Rage, RPM_Rage, BIO_Rage,
+        HUM_Rage, Total_Ract, soil_water_deficit), where ``Total_Ract`` is
+        the radioactive carbon of total SOC (see ``_age``)
+    """
+    rm_moist, swd = _moisture_factor(rain, evap, PC, smd_max_adj, smd_1bar,
+                                     smd_bare, swd)
+    rate = _temperature_factor(temp) * rm_moist * _plant_cover_factor(PC)
+
+    (DPM, RPM, BIO, HUM, SOC, DPM_R, RPM_R, BIO_R, HUM_R,
+     Total_Ract) = _decompose(DPM, RPM, BIO, HUM, IOM,
+                              DPM_R, RPM_R, BIO_R, HUM_R, IOM_R,
+                              math.exp(-rate * _DPM_K * dt),
+                              math.exp(-rate * _RPM_K * dt),
+                              math.exp(-rate * _BIO_K * dt),
+                              math.exp(-rate * _HUM_K * dt),
+                              plant_to_dpm, plant_to_rpm, fym_to_dpm,
+                              fym_to_rpm, fym_to_hum, mod, bio_frac,
+                              hum_frac, exc, conr)
+
+    return (DPM, RPM, BIO, HUM, SOC,
+            DPM_R, RPM_R, BIO_R, HUM_R, Total_Ract, swd)
+
+
+@njit(cache=True)
+def _split_inputs(C_inp, FYM, DPM_RPM):
+    """
+    Split the plant and FYM inputs between the pools, as ``CarbonInputs``.
+
+    Returns:
+        Tuple of (plant_to_dpm, plant_to_rpm, fym_to_dpm, fym_to_rpm,
+        fym_to_hum)
+    """
+    plant_to_dpm = DPM_RPM / (DPM_RPM + 1.0) * C_inp
+    return (plant_to_dpm, C_inp - plant_to_dpm, _FYM_TO_DPM * FYM,
+            _FYM_TO_RPM * FYM, _FYM_TO_HUM * FYM)
+
+
+@njit(cache=True)
+def _decompose(DPM, RPM, BIO, HUM, IOM, DPM_R, RPM_R, BIO_R, HUM_R, IOM_R,
+               DPM_f, RPM_f, BIO_f, HUM_f, plant_to_dpm, plant_to_rpm,
+               fym_to_dpm, fym_to_rpm, fym_to_hum, mod,
+               bio_frac, hum_frac, exc, conr):
+    """
+    Decompose, redistribute and add inputs given the decay factors.
+
+    ``*_f`` are the fractions of each pool remaining after decomposition,
+    i.e. ``exp(-rate_modifier * k * dt)``. The carbon inputs are given
+    split between the pools (see ``_split_inputs``). ``bio_frac`` and
+    ``hum_frac`` are the clay-dependent ``SoilProperties`` partitioning
+    fractions.
+
+    The radiocarbon age of total SOC is only needed for output, so its
+    radioactive carbon is returned instead and converted by the caller
+    with ``_age`` or ``_delta14c``.
+
+    Returns:
+        Tuple of (DPM, RPM, BIO, HUM, SOC, DPM_Rage, RPM_Rage, BIO_Rage,
+        HUM_Rage, Total_Ract)
+    """
+    # Decomposition
+    DPM_rem = DPM * DPM_f
+    RPM_rem = RPM * RPM_f
+    BIO_rem = BIO * BIO_f
+    HUM_rem = HUM * HUM_f
+
+    DPM_dec = DPM - DPM_rem
+    RPM_dec = RPM - RPM_rem
+    BIO_dec = BIO - BIO_rem
+    HUM_dec = HUM - HUM_rem
+
+    # Redistribution of decomposed carbon to BIO and HUM (rest is CO2)
+    DPM_bio = DPM_dec * bio_frac
+    RPM_bio = RPM_dec * bio_frac
+    BIO_bio = BIO_dec * bio_frac
+    HUM_bio = HUM_dec * bio_frac
+
+    DPM_hum = DPM_dec * hum_frac
+    RPM_hum = RPM_dec * hum_frac
+    BIO_hum = BIO_dec * hum_frac
+    HUM_hum = HUM_dec * hum_frac
+
+    # Carbon inputs
+    DPM_new = DPM_rem + plant_to_dpm + fym_to_dpm
+    RPM_new = RPM_rem + plant_to_rpm + fym_to_rpm
+    BIO_new = BIO_rem + DPM_bio + RPM_bio + BIO_bio + HUM_bio
+    HUM_new = HUM_rem + DPM_hum + RPM_hum + BIO_hum + HUM_hum + fym_to_hum
+
+    # Radiocarbon
+    DPM_decay = math.exp(-conr * DPM_R)
+    RPM_decay = math.exp(-conr * RPM_R)
+    BIO_decay = math.exp(-conr * BIO_R)
+    HUM_decay = math.exp(-conr * HUM_R)
+    IOM_Ract = IOM * math.exp(-conr * IOM_R)
+
+    DPM_Ract_new = mod * (fym_to_dpm + plant_to_dpm) + DPM_rem * DPM_decay * exc
+    RPM_Ract_new = mod * (fym_to_rpm + plant_to_rpm) + RPM_rem * RPM_decay * exc
+    BIO_Ract_new = (BIO_rem * BIO_decay + DPM_bio * DPM_decay +
+                    RPM_bio * RPM_decay + BIO_bio * BIO_decay +
+                    HUM_bio * HUM_decay) * exc
+    HUM_Ract_new = mod * fym_to_hum + (HUM_rem * HUM_decay +
+                                       DPM_hum * DPM_decay +
+                                       RPM_hum * RPM_decay +
+                                       BIO_hum * BIO_decay +
+                                       HUM_hum * HUM_decay) * exc
+
+    SOC = DPM_new + RPM_new + BIO_new + HUM_new + IOM
+    Total_Ract = (DPM_Ract_new + RPM_Ract_new + BIO_Ract_new +
+                  HUM_Ract_new + IOM_Ract)
+
+    DPM_R = _age(DPM_new, DPM_Ract_new, conr)
+    RPM_R = _age(RPM_new, RPM_Ract_new, conr)
+    BIO_R = _age(BIO_new, BIO_Ract_new, conr)
+    HUM_R = _age(HUM_new, HUM_Ract_new, conr)
+
+    return (DPM_new, RPM_new, BIO_new, HUM_new, SOC,
+            DPM_R, RPM_R, BIO_R, HUM_R, Total_Ract)
+
+
+@njit(cache=True)
+def _age(carbon_amount, radioactive_carbon, conr):
+    """Radiocarbon age from carbon amount and radioactive carbon."""
+    if carbon_amount <= _ZERO_THRESHOLD:
+        return 0.0
+    return math.log(carbon_amount / radioactive_carbon) / conr
+
+
+@njit(cache=True)
+def _delta14c(carbon_amount, radioactive_carbon, conr):
+    """
+    Delta 14C from carbon amount and radioactive carbon.
+
+    Equal to ``(exp(-_age(...) / 8035) - 1) * 1000`` but with a single
+    ``pow`` in place of the ``log``/``exp`` round trip.
+    """
+    if carbon_amount <= _ZERO_THRESHOLD:
+        return 0.0
+    ratio = radioactive_carbon / carbon_amount
+    return (ratio ** (1.0 / (conr * _DELTA14C_MEAN_LIFE)) - 1.0) * 1000.0
+
+
+@njit(cache=True)
+def _relative_change(current, previous):
+    """Change from ``previous`` to ``current`` relative to ``current``."""
+    return abs(current - previous) / max(abs(current), _ZERO_THRESHOLD)
+
+
+@njit(cache=True)
+def _pack(DPM, RPM, BIO, HUM, DPM_R, RPM_R, BIO_R, HUM_R, out):
+    """Write the active pools and their ages to ``out``."""
+    out[0] = DPM
+    out[1] = RPM
+    out[2] = BIO
+    out[3] = HUM
+    out[4] = DPM_R
+    out[5] = RPM_R
+    out[6] = BIO_R
+    out[7] = HUM_R
+
+
+@njit(cache=True)
+def _copy(source, out):
+    """Copy ``source`` into ``out`` element by element."""
+    for i in range(source.shape[0]):
+        out[i] = source[i]
+
+
+@njit(cache=True)
+def _year_end(DPM, RPM, BIO, HUM, DPM_R, RPM_R, BIO_R, HUM_R, conr, out):
+    """Write the active pools and their radioactive carbon to ``out``."""
+    out[0] = DPM
+    out[1] = RPM
+    out[2] = BIO
+    out[3] = HUM
+    out[4] = DPM * math.exp(-conr * DPM_R)
+    out[5] = RPM * math.exp(-conr * RPM_R)
+    out[6] = BIO * math.exp(-conr * BIO_R)
+    out[7] = HUM * math.exp(-conr * HUM_R)
+
+
+@njit(cache=True)
+def _aitken(history, conr, extrapolated):
+    """
+    Aitken delta-squared extrapolation of three consecutive year ends.
+
+    ``history`` rows are ``_year_end`` vectors, oldest first. A value is
+    extrapolated only where its second difference is not negligible
+    against its first differences, and is otherwise taken from the last
+    year end. ``extrapolated`` receives the DPM, RPM, BIO and HUM pools
+    followed by their radiocarbon ages.
+
+    Returns:
+        True if every extrapolated pool and radioactive carbon amount is
+        finite and not negative
+    """
+    for i in range(8):
+        x0 = history[0, i]
+        x1 = history[1, i]
+        x2 = history[2, i]
+        denominator = x2 - 2.0 * x1 + x0
+        if abs(denominator) > _AITKEN_GUARD * (abs(x2 - x1) + abs(x1 - x0)):
+            x2 = x2 - (x2 - x1) * (x2 - x1) / denominator
+        if not (math.isfinite(x2) and x2 >= 0.0):
+            return False
+        extrapolated[i] = x2
+    for i in range(4):
+        extrapolated[4 + i] = _age(extrapolated[i], extrapolated[4 + i], conr)
+        if not math.isfinite(extrapolated[4 + i]):
+            return False
+    return True
+
+
+@njit(cache=True)
+def _totals(DPM, RPM, BIO, HUM, IOM, DPM_R, RPM_R, BIO_R, HUM_R, IOM_R, conr):
+    """Total SOC and its radioactive carbon from the pools and their ages."""
+    SOC = DPM + RPM + BIO + HUM + IOM
+    Total_Ract = (DPM * math.exp(-conr * DPM_R) +
+                  RPM * math.exp(-conr * RPM_R) +
+                  BIO * math.exp(-conr * BIO_R) +
+                  HUM * math.exp(-conr * HUM_R) +
+                  IOM * math.exp(-conr * IOM_R))
+    return SOC, Total_Ract
+
+
+@njit(cache=True, inline='always')
+def _equilibrium(tmp, rain, evap, c_inp, fym, pc, dpm_rpm, mod, state,
+                 smd_max_adj, smd_1bar, smd_bare, bio_frac, hum_frac,
+                 exc, conr, dt, time_factor,
+                 tolerance, max_iterations):
+    """
+    Cycle the first ``time_factor`` timesteps until the state converges.
+
+    The loop runs whole years. After each one, convergence is tested on the
+    largest relative change since the previous year end of the DPM, RPM, BIO
+    and HUM pools, their radiocarbon ages and the total radiocarbon age. A
+    non-finite change ends the loop early. Every second year the year-end pools and their
+    radioactive carbon are pushed towards their fixed point with Aitken's
+    delta-squared extrapolation (``_aitken``), which cuts the spin-up from
+    thousands of years to a few hundred. Both follow the same linear yearly
+    map, so they are extrapolated instead of the ages, which are a
+    logarithm of them and may be negative.
+
+    An extrapolation is only kept if every extrapolated value is finite and
+    not negative, and the following year changes the pools and ages less
+    than the year before it did. Otherwise the loop goes back to the last
+    cycled year end and carries on cycling, so the spin-up never does worse
+    than plain yearly cycling.
+
+    ``state`` is a ``CarbonPools.state`` vector and is updated in place.
+
+    Returns:
+        Number of iterations run
+    """
+    DPM = state[POOL_DPM]
+    RPM = state[POOL_RPM]
+    BIO = state[POOL_BIO]
+    HUM = state[POOL_HUM]
+    IOM = state[POOL_IOM]
+    SOC = state[POOL_SOC]
+    DPM_R = state[POOL_DPM_RAGE]
+    RPM_R = state[POOL_RPM_RAGE]
+    BIO_R = state[POOL_BIO_RAGE]
+    HUM_R = state[POOL_HUM_RAGE]
+    IOM_R = state[POOL_IOM_RAGE]
+    Total_R = state[POOL_TOTAL_RAGE]
+    Total_Ract = SOC * math.exp(-conr * Total_R)
+
+    swd = 0.0
+    j = 0
+    test = 100.0
+
+    # Pools and ages at the previous year end, for the convergence test
+    previous = np.empty(8)
+    _pack(DPM, RPM, BIO, HUM, DPM_R, RPM_R, BIO_R, HUM_R, previous)
+    previous_total = Total_R
+
+    # Year ends for the extrapolation, oldest first. The ages are
+    # extrapolated through the radioactive carbon of each pool, which
+    # follows the same linear yearly map as the pools themselves.
+    history = np.empty((3, 8))
+    _year_end(DPM, RPM, BIO, HUM, DPM_R, RPM_R, BIO_R, HUM_R, conr,
+              history[0])
+    n_history = 1
+
+    # Last extrapolation, the year end it replaced and the yearly change
+    # before it; residual is negative when no extrapolation awaits checking
+    extrapolated = np.empty(8)
+    fallback = np.empty(8)
+    fallback_total = Total_R
+    residual = -1.0
+
+    # The same months are cycled every year, so the temperature and plant
+    # cover factors are computed once per month. The decay factors only
+    # change with the moisture factor, which repeats as soon as the soil
+    # water deficit has settled into its yearly cycle, so they are cached
+    # per month and recomputed only when the moisture factor differs.
+    rm_temp = np.empty(time_factor)
+    rm_pc = np.empty(time_factor)
+    for m in range(time_factor):
+        rm_temp[m] = _temperature_factor(tmp[m])
+        rm_pc[m] = _plant_cover_factor(pc[m])
+    cached_moist = np.full(time_factor, -1.0)
+    decay = np.empty((time_factor, 4))
+
+    # The split of the inputs between the pools also repeats every year
+    inputs = np.empty((time_factor, 5))
+    for m in range(time_factor):
+        (inputs[m, 0], inputs[m, 1], inputs[m, 2], inputs[m, 3],
+         inputs[m, 4]) = _split_inputs(c_inp[m], fym[m], dpm_rpm[m])
+
+    while test > tolerance and j <= max_iterations:
+        for k in range(time_factor):
+            rm_moist, swd = _moisture_factor(rain[k], evap[k], pc[k],
+                                             smd_max_adj, smd_1bar, smd_bare,
+                                             swd)
+            if rm_moist != cached_moist[k]:
+                rate = rm_temp[k] * rm_moist * rm_pc[k]
+                decay[k, 0] = math.exp(-rate * _DPM_K * dt)
+                decay[k, 1] = math.exp(-rate * _RPM_K * dt)
+                decay[k, 2] = math.exp(-rate * _BIO_K * dt)
+                decay[k, 3] = math.exp(-rate * _HUM_K * dt)
+                cached_moist[k] = rm_moist
+
+            (DPM, RPM, BIO, HUM, SOC, DPM_R, RPM_R, BIO_R, HUM_R,
+             Total_Ract) = _decompose(DPM, RPM, BIO, HUM, IOM,
+                                      DPM_R, RPM_R, BIO_R, HUM_R, IOM_R,
+                                      decay[k, 0], decay[k, 1],
+                                      decay[k, 2], decay[k, 3],
+                                      inputs[k, 0], inputs[k, 1],
+                                      inputs[k, 2], inputs[k, 3],
+                                      inputs[k, 4], mod[k], bio_frac,
+                                      hum_frac, exc, conr)
+
+        j += time_factor
+
+        # Check for convergence of the pools and ages at the end of each
+        # year. A non-finite state ends the loop, and is reported by the
+        # caller.
+        Total_R = _age(SOC, Total_Ract, conr)
+        test = max(_relative_change(DPM, previous[0]),
+                   _relative_change(RPM, previous[1]),
+                   _relative_change(BIO, previous[2]),
+                   _relative_change(HUM, previous[3]),
+                   _relative_change(DPM_R, previous[4]),
+                   _relative_change(RPM_R, previous[5]),
+                   _relative_change(BIO_R, previous[6]),
+                   _relative_change(HUM_R, previous[7]),
+                   _relative_change(Total_R, previous_total))
+        if not math.isfinite(test):
+            break
+
+        if residual >= 0.0:
+            residual_before = residual
+            residual = -1.0
+            if not test < residual_before:
+                # The extrapolation did not bring the pools and ages closer
+                # to their fixed point: go back to the year end it replaced
+                (DPM, RPM, BIO, HUM,
+                 DPM_R, RPM_R, BIO_R, HUM_R) = (
+                    fallback[0], fallback[1], fallback[2], fallback[3],
+                    fallback[4], fallback[5], fallback[6], fallback[7])
+                SOC, Total_Ract = _totals(DPM, RPM, BIO, HUM, IOM, DPM_R,
+                                          RPM_R, BIO_R, HUM_R, IOM_R, conr)
+                _copy(fallback, previous)
+                previous_total = fallback_total
+                _year_end(DPM, RPM, BIO, HUM, DPM_R, RPM_R, BIO_R, HUM_R,
+                          conr, history[0])
+                n_history = 1
+                test = residual_before
+                continue
+
+        _pack(DPM, RPM, BIO, HUM, DPM_R, RPM_R, BIO_R, HUM_R, previous)
+        previous_total = Total_R
+        _year_end(DPM, RPM, BIO, HUM, DPM_R, RPM_R, BIO_R, HUM_R, conr,
+                  history[n_history])
+        n_history += 1
+        if test > tolerance and n_history == 3:
+            if _aitken(history, conr, extrapolated):
+                _copy(previous, fallback)
+                fallback_total = previous_total
+                residual = test
+                (DPM, RPM, BIO, HUM,
+                 DPM_R, RPM_R, BIO_R, HUM_R) = (
+                    extrapolated[0], extrapolated[1], extrapolated[2],
+                    extrapolated[3], extrapolated[4], extrapolated[5],
+                    extrapolated[6], extrapolated[7])
+                _copy(extrapolated, previous)
+                _year_end(DPM, RPM, BIO, HUM, DPM_R, RPM_R, BIO_R, HUM_R,
+                          conr, history[0])
+                n_history = 1
+
+                # Keep the totals consistent with the extrapolated pools, in
+                # case the iteration limit ends the loop here
+                SOC, Total_Ract = _totals(DPM, RPM, BIO, HUM, IOM, DPM_R,
+                                          RPM_R, BIO_R, HUM_R, IOM_R, conr)
+                previous_total = _age(SOC, Total_Ract, conr)
+            else:
+                # Try again with the next year end
+                _copy(history[1], history[0])
+                _copy(history[2], history[1])
+                n_history = 2
+
+    state[POOL_DPM] = DPM
+    state[POOL_RPM] = RPM
+    state[POOL_BIO] = BIO
+    state[POOL_HUM] = HUM
+    state[POOL_SOC] = SOC
+    state[POOL_DPM_RAGE] = DPM_R
+    state[POOL_RPM_RAGE] = RPM_R
+    state[POOL_BIO_RAGE] = BIO_R
+    state[POOL_HUM_RAGE] = HUM_R
+    state[POOL_TOTAL_RAGE] = _age(SOC, Total_Ract, conr)
+
+    return j
+
+
+@njit(cache=True)
+def _advance(tmp, rain, evap, c_inp, fym, pc, dpm_rpm, mod, state,
+             smd_max_adj, smd_1bar, smd_bare, bio_frac, hum_frac,
+             swd, exc, conr, dt):
+    """
+    Advance the pools through a whole series of timesteps.
+
+    ``state`` is a ``CarbonPools.state`` vector and is updated in place.
+
+    Returns:
+        Soil water deficit after the last timestep
+    """
+    DPM = state[POOL_DPM]
+    RPM = state[POOL_RPM]
+    BIO = state[POOL_BIO]
+    HUM = state[POOL_HUM]
+    IOM = state[POOL_IOM]
+    SOC = state[POOL_SOC]
+    DPM_R = state[POOL_DPM_RAGE]
+    RPM_R = state[POOL_RPM_RAGE]
+    BIO_R = state[POOL_BIO_RAGE]
+    HUM_R = state[POOL_HUM_RAGE]
+    IOM_R = state[POOL_IOM_RAGE]
+    Total_Ract = SOC * math.exp(-conr * state[POOL_TOTAL_RAGE])
+
+    for i in range(tmp.shape[0]):
+        (plant_to_dpm, plant_to_rpm, fym_to_dpm, fym_to_rpm,
+         fym_to_hum) = _split_inputs(c_inp[i], fym[i], dpm_rpm[i])
+        (DPM, RPM, BIO, HUM, SOC, DPM_R, RPM_R, BIO_R, HUM_R, Total_Ract,
+         swd) = _step(DPM, RPM, BIO, HUM, IOM, DPM_R, RPM_R, BIO_R, HUM_R,
+                      IOM_R, tmp[i], rain[i], evap[i], plant_to_dpm,
+                      plant_to_rpm, fym_to_dpm, fym_to_rpm, fym_to_hum,
+                      pc[i], mod[i], smd_max_adj, smd_1bar, smd_bare,
+                      bio_frac, hum_frac, swd, exc, conr, dt)
+
+    state[POOL_DPM] = DPM
+    state[POOL_RPM] = RPM
+    state[POOL_BIO] = BIO
+    state[POOL_HUM] = HUM
+    state[POOL_SOC] = SOC
+    state[POOL_DPM_RAGE] = DPM_R
+    state[POOL_RPM_RAGE] = RPM_R
+    state[POOL_BIO_RAGE] = BIO_R
+    state[POOL_HUM_RAGE] = HUM_R
+    state[POOL_TOTAL_RAGE] = _age(SOC, Total_Ract, conr)
+
+    return swd
+
+
+@lru_cache(maxsize=None)
+def _compile_equilibrium(time_factor):
+    """
+    Build an ``_equilibrium`` kernel specialised for ``time_factor``.
+
+    The timestep, radiocarbon constants and ``time_factor`` itself are
+    closed over as literals and ``_equilibrium`` is inlined, so the
+    compiler can fold them (e.g. ``DPM_DECOMP_RATE * dt``) and compare the
+    month counter against a constant at the year end. Kernels are built
+    lazily and kept per ``time_factor``.
+    """
+    TF = int(time_factor)
+    DT = 1.0 / TF
+    CONR = math.log(2.0) / ModelConstants.RADIOCARBON_HALFLIFE
+    EXC = math.exp(-CONR * DT)
+
+    @njit(cache=True)
+    def equilibrium(tmp, rain, evap, c_inp, fym, pc, dpm_rpm, mod, state,
+                    smd_max_adj, smd_1bar, smd_bare, bio_frac, hum_frac,
+                    tolerance, max_iterations):
+        return _equilibrium(tmp, rain, evap, c_inp, fym, pc, dpm_rpm, mod,
+                            state, smd_max_adj, smd_1bar, smd_bare,
+                            bio_frac, hum_frac, EXC, CONR, DT, TF,
+                            tolerance, max_iterations)
+
+    return equilibrium
+
+
+@njit(cache=True, parallel=True)
+def _equilibrium_batch(inputs, states, soil_params, exc, conr, dt,
+                       time_factor, tolerance, max_iterations, iterations):
+    """
+    Run ``_equilibrium`` for many independent sites in parallel.
+
+    Args:
+        inputs: (n_sites, time_factor, 8) yearly inputs per site, columns
+            modern fraction, temperature, rainfall, evaporation, plant
+            carbon, FYM carbon, plant cover, DPM/RPM ratio
+        states: (n_sites, N_POOLS) state vectors, updated in place
+        soil_params: (n_sites, 5) smd_max_adj, smd_1bar, smd_bare,
+            bio_fraction, hum_fraction per site
+        iterations: (n_sites,) output array of iteration counts
+    """
+    for s in prange(states.shape[0]):
+        site = inputs[s]
+        soil = soil_params[s]
+        iterations[s] = _equilibrium(
+            site[:, 1], site[:, 2], site[:, 3], site[:, 4], site[:, 5],
+            site[:, 6], site[:, 7], site[:, 0], states[s],
+            soil[0], soil[1], soil[2], soil[3], soil[4],
+            exc, conr, dt, time_factor, tolerance, max_iterations
+        )
+
+
+@njit(cache=True)
+def _simulate_site(inputs, state, smd_max_adj, smd_1bar, smd_bare, bio_frac,
+                   hum_frac, exc, conr, dt, results):
+    """
+    Run one site forward through its input time series.
+
+    ``inputs`` has the columns of ``_equilibrium_batch`` and ``state`` is
+    updated in place. After each timestep ``i``, ``results[i]`` is filled
+    with DPM, RPM, BIO, HUM, IOM, SOC and delta 14C of total SOC.
+    """
+    DPM = state[POOL_DPM]
+    RPM = state[POOL_RPM]
+    BIO = state[POOL_BIO]
+    HUM = state[POOL_HUM]
+    IOM = state[POOL_IOM]
+    SOC = state[POOL_SOC]
+    DPM_R = state[POOL_DPM_RAGE]
+    RPM_R = state[POOL_RPM_RAGE]
+    BIO_R = state[POOL_BIO_RAGE]
+    HUM_R = state[POOL_HUM_RAGE]
+    IOM_R = state[POOL_IOM_RAGE]
+    Total_Ract = SOC * math.exp(-conr * state[POOL_TOTAL_RAGE])
+    swd = 0.0
+
+    for i in range(inputs.shape[0]):
+        (plant_to_dpm, plant_to_rpm, fym_to_dpm, fym_to_rpm,
+         fym_to_hum) = _split_inputs(inputs[i, 4], inputs[i, 5],
+                                     inputs[i, 7])
+        (DPM, RPM, BIO, HUM, SOC, DPM_R, RPM_R, BIO_R, HUM_R, Total_Ract,
+         swd) = _step(DPM, RPM, BIO, HUM, IOM, DPM_R, RPM_R, BIO_R, HUM_R,
+                      IOM_R, inputs[i, 1], inputs[i, 2], inputs[i, 3],
+                      plant_to_dpm, plant_to_rpm, fym_to_dpm, fym_to_rpm,
+                      fym_to_hum, int(inputs[i, 6]), inputs[i, 0],
+                      smd_max_adj, smd_1bar, smd_bare, bio_frac, hum_frac,
+                      swd, exc, conr, dt)
+        results[i, 0] = DPM
+        results[i, 1] = RPM
+        results[i, 2] = BIO
+        results[i, 3] = HUM
+        results[i, 4] = IOM
+        results[i, 5] = SOC
+        results[i, 6] = _delta14c(SOC, Total_Ract, conr)
+
+    state[POOL_DPM] = DPM
+    state[POOL_RPM] = RPM
+    state[POOL_BIO] = BIO
+    state[POOL_HUM] = HUM
+    state[POOL_SOC] = SOC
+    state[POOL_DPM_RAGE] = DPM_R
+    state[POOL_RPM_RAGE] = RPM_R
+    state[POOL_BIO_RAGE] = BIO_R
+    state[POOL_HUM_RAGE] = HUM_R
+    state[POOL_TOTAL_RAGE] = _age(SOC, Total_Ract, conr)
+
+
+@njit(cache=True, parallel=True)
+def _simulate_batch(inputs, states, soil_params, exc, conr, dt, results):
+    """
+    Run ``_simulate_site`` for many independent sites in parallel.
+
+    Args:
+        inputs: (n_sites, n_steps, 8) inputs per site, columns as in
+            ``_equilibrium_batch``
+        states: (n_sites, N_POOLS) state vectors, updated in place
+        soil_params: (n_sites, 5) as in ``_equilibrium_batch``
+        results: (n_sites, n_steps, 7) output array, see ``_simulate_site``
+    """
+    for s in prange(states.shape[0]):
+        soil = soil_params[s]
+        _simulate_site(inputs[s], states[s], soil[0], soil[1], soil[2],
+                       soil[3], soil[4], exc, conr, dt, results[s])
+
+
+@njit(cache=True)
+def _moisture_factors(rain, evap, pc, smd_max_adj, smd_1bar, smd_bare):
+    """
+    Moisture rate modifiers for a whole time series.
+
+    The soil water deficit is a sequential recurrence, so this scan cannot
+    be vectorised; it starts from a zero deficit.
+    """
+    n = rain.shape[0]
+    rm_moist = np.empty(n)
+    swd = 0.0
+    for i in range(n):
+        rm_moist[i], swd = _moisture_factor(rain[i], evap[i], pc[i],
+                                            smd_max_adj, smd_1bar, smd_bare,
+                                            swd)
+    return rm_moist
+
+
+@njit(cache=True)
+def _simulate(dpm_f, rpm_f, bio_f, hum_f, c_inp, fym, dpm_rpm, mod, state,
+              bio_frac, hum_frac, exc, conr, results):
+    """
+    Run the pool recurrence over precomputed decay factors.
+
+    ``state`` is a ``CarbonPools.state`` vector and is updated in place.
+    After each timestep ``i`` columns 2-8 of ``results[i]`` (laid out as
+    ``RESULT_COLUMNS``) are filled with DPM, RPM, BIO, HUM, IOM, SOC and
+    delta 14C of total SOC.
+    """
+    DPM = state[POOL_DPM]
+    RPM = state[POOL_RPM]
+    BIO = state[POOL_BIO]
+    HUM = state[POOL_HUM]
+    IOM = state[POOL_IOM]
+    SOC = state[POOL_SOC]
+    DPM_R = state[POOL_DPM_RAGE]
+    RPM_R = state[POOL_RPM_RAGE]
+    BIO_R = state[POOL_BIO_RAGE]
+    HUM_R = state[POOL_HUM_RAGE]
+    IOM_R = state[POOL_IOM_RAGE]
+    Total_Ract = SOC * math.exp(-conr * state[POOL_TOTAL_RAGE])
+
+    for i in range(dpm_f.shape[0]):
+        (plant_to_dpm, plant_to_rpm, fym_to_dpm, fym_to_rpm,
+         fym_to_hum) = _split_inputs(c_inp[i], fym[i], dpm_rpm[i])
+        (DPM, RPM, BIO, HUM, SOC, DPM_R, RPM_R, BIO_R, HUM_R,
+         Total_Ract) = _decompose(DPM, RPM, BIO, HUM, IOM,
+                                  DPM_R, RPM_R, BIO_R, HUM_R, IOM_R,
+                                  dpm_f[i], rpm_f[i], bio_f[i], hum_f[i],
+                                  plant_to_dpm, plant_to_rpm, fym_to_dpm,
+                                  fym_to_rpm, fym_to_hum, mod[i],
+                                  bio_frac, hum_frac, exc, conr)
+        results[i, 2] = DPM
+        results[i, 3] = RPM
+        results[i, 4] = BIO
+        results[i, 5] = HUM
+        results[i, 6] = IOM
+        results[i, 7] = SOC
+        results[i, 8] = _delta14c(SOC, Total_Ract, conr)
+
+    state[POOL_DPM] = DPM
+    state[POOL_RPM] = RPM
+    state[POOL_BIO] = BIO
+    state[POOL_HUM] = HUM
+    state[POOL_SOC] = SOC
+    state[POOL_DPM_RAGE] = DPM_R
+    state[POOL_RPM_RAGE] = RPM_R
+    state[POOL_BIO_RAGE] = BIO_R
+    state[POOL_HUM_RAGE] = HUM_R
+    state[POOL_TOTAL_RAGE] = _age(SOC, Total_Ract, conr)
@@ -1,42 +1,87 @@
 """
 Physical and chemical constants used in the RothC model.
+
+The constants are defined at module level, so that frequently evaluated
+code can import them directly, and are also available as attributes of
+``ModelConstants``.
 """
 
+# Decomposition rate constants (per year for monthly timestep)
+DPM_DECOMP_RATE = 10.0      # Decomposable Plant Material
+RPM_DECOMP_RATE = 0.3       # Resistant Plant Material
+BIO_DECOMP_RATE = 0.66      # Microbial Biomass
+HUM_DECOMP_RATE = 0.02      # Humified Organic Matter
+
+# Radiocarbon decay constant
+RADIOCARBON_HALFLIFE = 5568.0  # years (Libby half-life)
+DELTA14C_MEAN_LIFE = 8035.0    # years, converts age to delta 14C
+
+# FYM (Farmyard Manure) carbon split fractions
+FYM_TO_DPM = 0.49
+FYM_TO_RPM = 0.49
+FYM_TO_HUM = 0.02
+
+# Carbon pool redistribution fractions
+FRACTION_TO_BIO = 0.46
+FRACTION_TO_HUM = 0.54
+
+# Rate modifying factor limits
+RMF_MOISTURE_MAX = 1.0
+RMF_MOISTURE_MIN = 0.2
+RMF_PLANT_COVER_BARE = 1.0
+RMF_PLANT_COVER_VEGETATED = 0.6
+
+# Soil moisture constants
+SMD_DEPTH_ADJUSTMENT = 23.0  # cm
+SMD_1BAR_FRACTION = 0.444
+SMD_BARE_FRACTION = 0.556
+
+# Numerical threshold
+ZERO_THRESHOLD = 1e-8
+
+# Convergence criteria (largest relative yearly change of the active pools,
+# their radiocarbon ages and the total radiocarbon age)
+EQUILIBRIUM_TOLERANCE = 1e-8
+MAX_EQUILIBRIUM_ITERATIONS = 1000000
+
 
 class ModelConstants:
     """Physical and chemical constants used in RothC model."""
     
     # Decomposition rate constants (per year for monthly timestep)
-    DPM_DECOMP_RATE = 10.0      # Decomposable Plant Material
-    RPM_DECOMP_RATE = 0.3       # Resistant Plant Material
-    BIO_DECOMP_RATE = 0.66      # Microbial Biomass
-    HUM_DECOMP_RATE = 0.02      # Humified Organic Matter
+    DPM_DECOMP_RATE = DPM_DECOMP_RATE
+    RPM_DECOMP_RATE = RPM_DECOMP_RATE
+    BIO_DECOMP_RATE = BIO_DECOMP_RATE
+    HUM_DECOMP_RATE = HUM_DECOMP_RATE
     
     # Radiocarbon decay constant
-    RADIOCARBON_HALFLIFE = 5568.0  # years (Libby half-life)
+    RADIOCARBON_HALFLIFE = RADIOCARBON_HALFLIFE
+    DELTA14C_MEAN_LIFE = DELTA14C_MEAN_LIFE
     
     # FYM (Farmyard Manure) carbon split fractions
-    FYM_TO_DPM = 0.49
-    FYM_TO_RPM = 0.49
-    FYM_TO_HUM = 0.02
+    FYM_TO_DPM = FYM_TO_DPM
+    FYM_TO_RPM = FYM_TO_RPM
+    FYM_TO_HUM = FYM_TO_HUM
     
     # Carbon pool redistribution fractions
-    FRACTION_TO_BIO = 0.46
-    FRACTION_TO_HUM = 0.54
+    FRACTION_TO_BIO = FRACTION_TO_BIO
+    FRACTION_TO_HUM = FRACTION_TO_HUM
     
     # Rate modifying factor limits
-    RMF_MOISTURE_MAX = 1.0
-    RMF_MOISTURE_MIN = 0.2
-    RMF_PLANT_COVER_BARE = 1.0
-    RMF_PLANT_COVER_VEGETATED = 0.6
+    RMF_MOISTURE_MAX = RMF_MOISTURE_MAX
+    RMF_MOISTURE_MIN = RMF_MOISTURE_MIN
+    RMF_PLANT_COVER_BARE = RMF_PLANT_COVER_BARE
+    RMF_PLANT_COVER_VEGETATED = RMF_PLANT_COVER_VEGETATED
     
     # Soil moisture constants
-    SMD_DEPTH_ADJUSTMENT = 23.0  # cm
-    SMD_1BAR_FRACTION = 0.444
-    SMD_BARE_FRACTION = 0.556
+    SMD_DEPTH_ADJUSTMENT = SMD_DEPTH_ADJUSTMENT
+    SMD_1BAR_FRACTION = SMD_1BAR_FRACTION
+    SMD_BARE_FRACTION = SMD_BARE_FRACTION
     
     # Numerical threshold
-    ZERO_THRESHOLD = 1e-8
+    ZERO_THRESHOLD = ZERO_THRESHOLD
     
-    # Convergence criteria
-    EQUILIBRIUM_TOLERANCE = 1e-6
+    # Convergence criteria (largest relative yearly change of the active
+    # pools, their radiocarbon ages and the total radiocarbon age)
+    EQUILIBRIUM_TOLERANCE = EQUILIBRIUM_TOLERANCE
+    MAX_EQUILIBRIUM_ITERATIONS = MAX_EQUILIBRIUM_ITERATIONS
@@ -2,12 +2,26 @@
 Data input/output handling for RothC model.
 """
 
-from typing import List, Tuple
+from typing import Tuple, Union, List
+import numpy as np
 import pandas as pd
 
 from .data_structures import SoilProperties
 
 
+# Columns of the time series in the input file
+INPUT_COLUMNS = ['t_year', 't_month', 't_mod', 't_tmp', 't_rain', 't_evap', 
+                 't_C_Inp', 't_FYM_Inp', 't_PC', 't_DPM_RPM']
+
+# Parsed column types, matching what the simulation kernels consume
+INPUT_DTYPES = dict.fromkeys(INPUT_COLUMNS, np.float64)
+INPUT_DTYPES.update(t_year=np.int32, t_month=np.int32, t_PC=np.int64)
+
+# Columns of the year and month result tables
+RESULT_COLUMNS = ["Year", "Month", "DPM_t_C_ha", "RPM_t_C_ha", "BIO_t_C_ha", 
+                  "HUM_t_C_ha", "IOM_t_C_ha", "SOC_t_C_ha", "deltaC"]
+
+
 class DataHandler:
     """Handle data input and output for RothC model."""
     
@@ -22,49 +36,57 @@ class DataHandler:
         Returns:
             Tuple of (time series data, soil properties, initial IOM, number of steps)
         """
-        # Read header information
-        df_head = pd.read_csv(input_file, skiprows=3, header=0, nrows=1, 
-                             index_col=None, delim_whitespace=True)
+        # Read the file once: header lines first, then the time series
+        # is parsed straight from the same handle
+        with open(input_file) as f:
+            lines = [f.readline() for _ in range(7)]
+            
+            # Time series data follows its own column header line
+            df = pd.read_csv(f, sep=r'\s+', engine='c', header=None, 
+                            index_col=None, names=INPUT_COLUMNS, 
+                            dtype=INPUT_DTYPES)
+        
+        # Header information: names on line 4, values on line 5
+        header = dict(zip(lines[3].split(), lines[4].split()))
         
         # Extract soil properties
         soil = SoilProperties(
-            clay=df_head.loc[0, "clay"],
-            depth=df_head.loc[0, "depth"]
+            clay=float(header["clay"]),
+            depth=float(header["depth"])
         )
-        iom_initial = df_head.loc[0, "iom"]
-        nsteps = int(df_head.loc[0, "nsteps"])
-        
-        # Read time series data
-        df = pd.read_csv(input_file, skiprows=6, header=0, 
-                        index_col=None, delim_whitespace=True)
-        df.columns = ['t_year', 't_month', 't_mod', 't_tmp', 't_rain', 't_evap', 
-                     't_C_Inp', 't_FYM_Inp', 't_PC', 't_DPM_RPM']
+        iom_initial = float(header["iom"])
+        nsteps = int(float(header["nsteps"]))
         
         return df, soil, iom_initial, nsteps
     
     @staticmethod
     def save_results(
-        year_results: List[List],
-        month_results: List[List],
+        year_results: Union[np.ndarray, List[List]],
+        month_results: Union[np.ndarray, List[List]],
         year_output_file: str = 'year_results.csv',
         month_output_file: str = 'month_results.csv'
     ) -> None:
         """
         Save model results to CSV files.
         
+        Year and Month are written as integers and pool values in their
+        shortest form that reads back exactly (``repr``).
+        
         Args:
             year_results: Annual results data
             month_results: Monthly results data
             year_output_file: Output file for annual results
             month_output_file: Output file for monthly results
         """
-        columns = ["Year", "Month", "DPM_t_C_ha", "RPM_t_C_ha", "BIO_t_C_ha", 
-                  "HUM_t_C_ha", "IOM_t_C_ha", "SOC_t_C_ha", "deltaC"]
-        
-        output_years = pd.DataFrame(year_results, columns=columns)
-        output_months = pd.DataFrame(month_results, columns=columns)
-        
-        output_years.to_csv(year_output_file, index=False)
-        output_months.to_csv(month_output_file, index=False)
-        
-        print(f"Results saved to {year_output_file} and {month_output_file}")
+        _write_results(year_output_file, year_results)
+        _write_results(month_output_file, month_results)
+
+
+def _write_results(path: str, results: Union[np.ndarray, List[List]]) -> None:
+    """Write one result table as CSV with a ``RESULT_COLUMNS`` header."""
+    lines = [','.join(RESULT_COLUMNS)]
+    for row in np.asarray(results, dtype=float).tolist():
+        lines.append(f"{int(row[0])},{int(row[1])},"
+                     + ','.join(map(repr, row[2:])))
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
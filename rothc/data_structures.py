@@ -2,52 +2,217 @@
 Data structures for RothC model components.
 """
 
-from typing import List
+from functools import lru_cache
+from math import exp
+from typing import Tuple
 from dataclasses import dataclass
+import numpy as np
+
+from .constants import (
+    FRACTION_TO_BIO, FRACTION_TO_HUM, FYM_TO_DPM, FYM_TO_RPM, FYM_TO_HUM,
+    SMD_DEPTH_ADJUSTMENT, SMD_1BAR_FRACTION, SMD_BARE_FRACTION
+)
+
+
+# Positions of each pool in the CarbonPools state vector
+(POOL_DPM, POOL_RPM, POOL_BIO, POOL_HUM, POOL_IOM, POOL_SOC,
+ POOL_DPM_RAGE, POOL_RPM_RAGE, POOL_BIO_RAGE, POOL_HUM_RAGE,
+ POOL_IOM_RAGE, POOL_TOTAL_RAGE) = range(12)
+
+N_POOLS = 12
+
+
+def _pool_property(index: int, doc: str) -> property:
+    """Expose one element of the state vector as a scalar attribute."""
+    def getter(self) -> float:
+        return self.state[index]
+    
+    def setter(self, value: float) -> None:
+        self.state[index] = value
+    
+    return property(getter, setter, doc=doc)
 
 
-@dataclass
 class CarbonPools:
-    """Container for carbon pool values and their radiocarbon ages."""
-    DPM: List[float]           # Decomposable Plant Material (t C/ha)
-    RPM: List[float]           # Resistant Plant Material (t C/ha)
-    BIO: List[float]           # Microbial Biomass (t C/ha)
-    HUM: List[float]           # Humified Organic Matter (t C/ha)
-    IOM: List[float]           # Inert Organic Matter (t C/ha)
-    SOC: List[float]           # Total Soil Organic Carbon (t C/ha)
-    
-    DPM_Rage: List[float]      # Radiocarbon age of DPM (years)
-    RPM_Rage: List[float]      # Radiocarbon age of RPM (years)
-    BIO_Rage: List[float]      # Radiocarbon age of BIO (years)
-    HUM_Rage: List[float]      # Radiocarbon age of HUM (years)
-    IOM_Rage: List[float]      # Radiocarbon age of IOM (years)
-    Total_Rage: List[float]    # Radiocarbon age of total SOC (years)
+    """
+    Container for carbon pool values and their radiocarbon ages.
+    
+    All values live in a single ``state`` vector, indexed by the
+    ``POOL_*`` constants. Each named attribute reads and writes one element
+    of that vector as a scalar, e.g. ``pools.DPM``.
+    """
+    
+    __slots__ = ('state',)
+    
+    DPM = _pool_property(POOL_DPM, "Decomposable Plant Material (t C/ha)")
+    RPM = _pool_property(POOL_RPM, "Resistant Plant Material (t C/ha)")
+    BIO = _pool_property(POOL_BIO, "Microbial Biomass (t C/ha)")
+    HUM = _pool_property(POOL_HUM, "Humified Organic Matter (t C/ha)")
+    IOM = _pool_property(POOL_IOM, "Inert Organic Matter (t C/ha)")
+    SOC = _pool_property(POOL_SOC, "Total Soil Organic Carbon (t C/ha)")
+    
+    DPM_Rage = _pool_property(POOL_DPM_RAGE, "Radiocarbon age of DPM (years)")
+    RPM_Rage = _pool_property(POOL_RPM_RAGE, "Radiocarbon age of RPM (years)")
+    BIO_Rage = _pool_property(POOL_BIO_RAGE, "Radiocarbon age of BIO (years)")
+    HUM_Rage = _pool_property(POOL_HUM_RAGE, "Radiocarbon age of HUM (years)")
+    IOM_Rage = _pool_property(POOL_IOM_RAGE, "Radiocarbon age of IOM (years)")
+    Total_Rage = _pool_property(POOL_TOTAL_RAGE,
+                                "Radiocarbon age of total SOC (years)")
+    
+    def __init__(
+        self,
+        DPM, RPM, BIO, HUM, IOM, SOC,
+        DPM_Rage, RPM_Rage, BIO_Rage, HUM_Rage, IOM_Rage, Total_Rage,
+        dtype: np.dtype = np.float64
+    ):
+        """
+        Initialize carbon pools.
+        
+        Each pool argument is a float. ``dtype`` sets the precision in which
+        the state vector is stored. float32 is a storage format only: it
+        halves the memory of large batch runs, but every kernel converts to
+        float64 and computes in float64, so it does not make the arithmetic
+        faster or wider.
+        """
+        self.state = np.zeros(N_POOLS, dtype=dtype)
+        self.DPM = DPM
+        self.RPM = RPM
+        self.BIO = BIO
+        self.HUM = HUM
+        self.IOM = IOM
+        self.SOC = SOC
+        self.DPM_Rage = DPM_Rage
+        self.RPM_Rage = RPM_Rage
+        self.BIO_Rage = BIO_Rage
+        self.HUM_Rage = HUM_Rage
+        self.IOM_Rage = IOM_Rage
+        self.Total_Rage = Total_Rage
+    
+    def __repr__(self) -> str:
+        return (f"CarbonPools(DPM={self.DPM}, RPM={self.RPM}, "
+                f"BIO={self.BIO}, HUM={self.HUM}, IOM={self.IOM}, "
+                f"SOC={self.SOC})")
     
     def update_total_soc(self) -> None:
         """Update total SOC from individual pools."""
-        self.SOC[0] = self.DPM[0] + self.RPM[0] + self.BIO[0] + self.HUM[0] + self.IOM[0]
+        self.state[POOL_SOC] = self.state[:POOL_IOM + 1].sum()
 
 
-@dataclass
+@lru_cache(maxsize=64)
+def _clay_factors(clay: float) -> Tuple[float, float]:
+    """
+    Partitioning of decomposed carbon for a clay content.
+    
+    Memoised because batch runs build many soils that share a handful of
+    distinct clay values.
+    
+    Returns:
+        Tuple of (BIO fraction, HUM fraction); the rest is lost as CO2
+    """
+    # CO2:(BIO+HUM) ratio
+    clay_x = 1.67 * (1.85 + 1.60 * exp(-0.0786 * clay))
+    inv = 1.0 / (clay_x + 1.0)
+    return FRACTION_TO_BIO * inv, FRACTION_TO_HUM * inv
+
+
+@dataclass(frozen=True)
 class SoilProperties:
-    """Container for soil physical properties."""
+    """
+    Container for soil physical properties.
+    
+    Quantities that depend only on clay and depth are derived once in
+    ``__post_init__`` so they are not recomputed every timestep. The
+    properties are frozen so the derived values cannot go stale; use
+    ``dataclasses.replace`` for a copy with another clay or depth.
+    """
+    __slots__ = (
+        'clay', 'depth',
+        # Derived soil moisture deficit thresholds (mm)
+        'smd_max_adj', 'smd_1bar', 'smd_bare',
+        # Derived partitioning of decomposed carbon
+        'bio_fraction', 'hum_fraction',
+    )
+    
     clay: float        # Clay content (%)
     depth: float       # Topsoil depth (cm)
     
+    def __post_init__(self) -> None:
+        """Derive clay- and depth-dependent constants."""
+        smd_max = -(20.0 + 1.3 * self.clay - 0.01 * (self.clay ** 2))
+        smd_max_adj = smd_max * self.depth / SMD_DEPTH_ADJUSTMENT
+        bio_fraction, hum_fraction = _clay_factors(float(self.clay))
+        
+        derived = {
+            'smd_max_adj': smd_max_adj,
+            'smd_1bar': SMD_1BAR_FRACTION * smd_max_adj,
+            'smd_bare': SMD_BARE_FRACTION * smd_max_adj,
+            'bio_fraction': bio_fraction,
+            'hum_fraction': hum_fraction,
+        }
+        # The dataclass is frozen, so set the derived fields directly
+        for name, value in derived.items():
+            object.__setattr__(self, name, value)
+    
 
 @dataclass
 class ClimateData:
     """Container for climate input data."""
+    __slots__ = ('temperature', 'rainfall', 'evaporation')
+    
     temperature: float      # Air temperature (°C)
     rainfall: float         # Rainfall (mm)
     evaporation: float      # Open pan evaporation (mm)
     
 
-@dataclass
+@dataclass(frozen=True)
 class CarbonInputs:
-    """Container for carbon input data."""
+    """
+    Container for carbon input data.
+    
+    The split of the plant and FYM inputs between the pools is derived
+    once on construction and passed to the timestep kernel as it is. The
+    inputs are frozen so the split cannot go stale; use
+    ``dataclasses.replace`` for a copy with other inputs.
+    """
+    __slots__ = (
+        'plant_carbon', 'fym_carbon', 'dpm_rpm_ratio', 'plant_cover',
+        'modern_carbon',
+        # Derived carbon added to each pool (t C/ha)
+        'plant_to_dpm', 'plant_to_rpm', 'fym_to_dpm', 'fym_to_rpm',
+        'fym_to_hum',
+        # Derived radioactive carbon added to each pool
+        'plant_dpm_Ract', 'plant_rpm_Ract', 'fym_dpm_Ract', 'fym_rpm_Ract',
+        'fym_hum_Ract',
+    )
+    
     plant_carbon: float     # Plant residue carbon input (t C/ha)
     fym_carbon: float       # Farmyard manure carbon input (t C/ha)
     dpm_rpm_ratio: float    # Ratio of DPM to RPM in plant inputs
     plant_cover: int        # Plant cover flag (0=bare, 1=vegetated)
     modern_carbon: float    # Fraction modern carbon (for radiocarbon)
+    
+    def __post_init__(self) -> None:
+        """Derive the carbon and radioactive carbon added to each pool."""
+        plant_to_dpm = (self.dpm_rpm_ratio / (self.dpm_rpm_ratio + 1.0) *
+                        self.plant_carbon)
+        plant_to_rpm = self.plant_carbon - plant_to_dpm
+        fym_to_dpm = FYM_TO_DPM * self.fym_carbon
+        fym_to_rpm = FYM_TO_RPM * self.fym_carbon
+        fym_to_hum = FYM_TO_HUM * self.fym_carbon
+        mod = self.modern_carbon
+        
+        derived = {
+            'plant_to_dpm': plant_to_dpm,
+            'plant_to_rpm': plant_to_rpm,
+            'fym_to_dpm': fym_to_dpm,
+            'fym_to_rpm': fym_to_rpm,
+            'fym_to_hum': fym_to_hum,
+            'plant_dpm_Ract': mod * plant_to_dpm,
+            'plant_rpm_Ract': mod * plant_to_rpm,
+            'fym_dpm_Ract': mod * fym_to_dpm,
+            'fym_rpm_Ract': mod * fym_to_rpm,
+            'fym_hum_Ract': mod * fym_to_hum,
+        }
+        # The dataclass is frozen, so set the derived fields directly
+        for name, value in derived.items():
+            object.__setattr__(self, name, value)
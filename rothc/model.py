@@ -2,11 +2,14 @@
 Main RothC model controller.
 """
 
-from typing import List
+import numpy as np
 
 from .decomposition import DecompositionModel
 from .rate_modifiers import RateModifiers
 from .data_structures import CarbonPools, ClimateData, CarbonInputs, SoilProperties
+from .data_structures import (POOL_DPM, POOL_HUM, POOL_SOC, POOL_DPM_RAGE,
+                              POOL_HUM_RAGE, POOL_TOTAL_RAGE)
+from ._kernels import _advance, _step, _age
 
 
 class RothCModel:
@@ -29,8 +32,9 @@ class RothCModel:
         climate: ClimateData,
         inputs: CarbonInputs,
         soil: SoilProperties,
-        soil_water_deficit: List[float]
-    ) -> None:
+        soil_water_deficit: float,
+        update_totals: bool = True
+    ) -> float:
         """
         Run one timestep of the RothC model.
         
@@ -39,20 +43,99 @@ class RothCModel:
             climate: Climate data for this timestep
             inputs: Carbon inputs for this timestep
             soil: Soil properties
-            soil_water_deficit: Soil water deficit (modified in place)
+            soil_water_deficit: Soil water deficit at the start of the
+                timestep (mm)
+            update_totals: Update total SOC and its radiocarbon age. When
+                stepping many times, pass False and call
+                ``decomp_model.finalize_totals`` only before reading them
+            
+        Returns:
+            Soil water deficit at the end of the timestep (mm)
         """
-        # Calculate rate modifying factors
-        rm_temp = self.rate_modifiers.calculate_temperature_factor(climate.temperature)
-        rm_moisture = self.rate_modifiers.calculate_moisture_factor(
-            climate.rainfall, climate.evaporation, soil, 
-            inputs.plant_cover, soil_water_deficit
-        )
-        rm_plant_cover = self.rate_modifiers.calculate_plant_cover_factor(
-            inputs.plant_cover
+        return self._fused_step(pools, climate, inputs, soil,
+                                soil_water_deficit, update_totals)
+    
+    def _fused_step(
+        self,
+        pools: CarbonPools,
+        climate: ClimateData,
+        inputs: CarbonInputs,
+        soil: SoilProperties,
+        soil_water_deficit: float,
+        update_totals: bool = True
+    ) -> float:
+        """
+        Single-call implementation of ``run_timestep``.
+        
+        Rate modifiers, decomposition, redistribution, inputs and ages are
+        computed on scalars by the ``_step`` kernel, instead of through the
+        ``RateModifiers`` and ``DecompositionModel`` methods, which remain
+        available for inspecting the individual processes.
+        """
+        state = pools.state
+        values = state.tolist()
+        decomp = self.decomp_model
+        (*pools_new, Total_Ract, soil_water_deficit) = _step(
+            *values[:POOL_SOC], *values[POOL_DPM_RAGE:POOL_TOTAL_RAGE],
+            climate.temperature, climate.rainfall, climate.evaporation,
+            inputs.plant_to_dpm, inputs.plant_to_rpm, inputs.fym_to_dpm,
+            inputs.fym_to_rpm, inputs.fym_to_hum, int(inputs.plant_cover),
+            inputs.modern_carbon,
+            soil.smd_max_adj, soil.smd_1bar, soil.smd_bare,
+            soil.bio_fraction, soil.hum_fraction, float(soil_water_deficit),
+            decomp.exc, decomp.conr, decomp.time_step
         )
         
-        # Combine rate modifiers
-        combined_rate_modifier = rm_temp * rm_moisture * rm_plant_cover
+        state[POOL_DPM:POOL_HUM + 1] = pools_new[:4]
+        state[POOL_DPM_RAGE:POOL_HUM_RAGE + 1] = pools_new[5:]
+        if update_totals:
+            state[POOL_SOC] = pools_new[4]
+            state[POOL_TOTAL_RAGE] = _age(pools_new[4], Total_Ract, decomp.conr)
         
-        # Run decomposition
-        self.decomp_model.run_decomposition(pools, inputs, combined_rate_modifier, soil)
+        return soil_water_deficit
+    
+    def run_timesteps(
+        self,
+        pools: CarbonPools,
+        temperature: np.ndarray,
+        rainfall: np.ndarray,
+        evaporation: np.ndarray,
+        plant_carbon: np.ndarray,
+        fym_carbon: np.ndarray,
+        dpm_rpm_ratio: np.ndarray,
+        plant_cover: np.ndarray,
+        modern_carbon: np.ndarray,
+        soil: SoilProperties,
+        soil_water_deficit: float = 0.0
+    ) -> float:
+        """
+        Run a series of timesteps in one compiled loop.
+        
+        Equivalent to calling ``run_timestep`` once per element of the
+        input arrays, without building ``ClimateData``/``CarbonInputs``
+        objects for each step.
+        
+        Args:
+            pools: Carbon pools (modified in place)
+            temperature, rainfall, evaporation: Climate per timestep
+            plant_carbon, fym_carbon, dpm_rpm_ratio, plant_cover,
+            modern_carbon: Carbon inputs per timestep, as in ``CarbonInputs``
+            soil: Soil properties
+            soil_water_deficit: Soil water deficit at the start (mm)
+            
+        Returns:
+            Soil water deficit after the last timestep (mm)
+        """
+        def as_array(values, dtype=np.float64):
+            return np.ascontiguousarray(values, dtype=dtype)
+        
+        decomp = self.decomp_model
+        return _advance(
+            as_array(temperature), as_array(rainfall), as_array(evaporation),
+            as_array(plant_carbon), as_array(fym_carbon),
+            as_array(plant_cover, np.int64), as_array(dpm_rpm_ratio),
+            as_array(modern_carbon), pools.state,
+            soil.smd_max_adj, soil.smd_1bar, soil.smd_bare,
+            soil.bio_fraction, soil.hum_fraction, float(soil_water_deficit),
+            decomp.exc, decomp.conr, decomp.time_step
+        )
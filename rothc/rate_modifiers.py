@@ -2,13 +2,20 @@
 Rate modifying factors for decomposition.
 """
 
-from typing import List
-import numpy as np
+from math import exp
+from typing import Tuple
 
-from .constants import ModelConstants
+from .constants import (
+    RMF_MOISTURE_MAX, RMF_MOISTURE_MIN, RMF_PLANT_COVER_BARE,
+    RMF_PLANT_COVER_VEGETATED
+)
 from .data_structures import SoilProperties
 
 
+# Span of the moisture rate modifier between dry and moist soil
+_RMF_MOISTURE_RANGE = RMF_MOISTURE_MAX - RMF_MOISTURE_MIN
+
+
 class RateModifiers:
     """Calculate rate modifying factors for decomposition."""
     
@@ -26,7 +33,7 @@ class RateModifiers:
         if temperature < -5.0:
             return 0.0
         else:
-            return 47.91 / (np.exp(106.06 / (temperature + 18.27)) + 1.0)
+            return 47.91 / (exp(106.06 / (temperature + 18.27)) + 1.0)
     
     @staticmethod
     def calculate_moisture_factor(
@@ -34,8 +41,8 @@ class RateModifiers:
         evaporation: float,
         soil: SoilProperties,
         plant_cover: int,
-        soil_water_deficit: List[float]
-    ) -> float:
+        soil_water_deficit: float
+    ) -> Tuple[float, float]:
         """
         Calculate rate modifying factor for soil moisture.
         
@@ -44,38 +51,39 @@ class RateModifiers:
             evaporation: Monthly open pan evaporation (mm)
             soil: Soil properties
             plant_cover: Plant cover flag (0=bare, 1=vegetated)
-            soil_water_deficit: Soil water deficit list [mm] (modified in place)
+            soil_water_deficit: Soil water deficit at the start of the
+                timestep (mm)
             
         Returns:
-            Moisture rate modifier (0.0 to 1.0)
+            Tuple of (moisture rate modifier (0.0 to 1.0), updated soil
+            water deficit (mm))
         """
-        # Calculate maximum soil moisture deficit
-        SMDMax = -(20.0 + 1.3 * soil.clay - 0.01 * (soil.clay ** 2))
-        SMDMaxAdj = SMDMax * soil.depth / ModelConstants.SMD_DEPTH_ADJUSTMENT
-        
-        # Calculate threshold values
-        SMD1bar = ModelConstants.SMD_1BAR_FRACTION * SMDMaxAdj
-        SMDBare = ModelConstants.SMD_BARE_FRACTION * SMDMaxAdj
+        # Soil moisture deficit thresholds (fixed for a given soil)
+        SMDMaxAdj = soil.smd_max_adj
+        SMD1bar = soil.smd_1bar
+        SMDBare = soil.smd_bare
         
         # Calculate drainage factor
         drainage_factor = rainfall - 0.75 * evaporation
         
         # Update soil water deficit
-        min_swc_df = np.min([0.0, soil_water_deficit[0] + drainage_factor])
-        min_smd_bare_swc = np.min([SMDBare, soil_water_deficit[0]])
+        swd = soil_water_deficit
+        min_swc_df = swd + drainage_factor
+        min_swc_df = min_swc_df if min_swc_df < 0.0 else 0.0
+        min_smd_bare_swc = SMDBare if SMDBare < swd else swd
         
         if plant_cover == 1:
-            soil_water_deficit[0] = np.max([SMDMaxAdj, min_swc_df])
+            swd = SMDMaxAdj if SMDMaxAdj > min_swc_df else min_swc_df
         else:
-            soil_water_deficit[0] = np.max([min_smd_bare_swc, min_swc_df])
+            swd = (min_smd_bare_swc if min_smd_bare_swc > min_swc_df 
+                   else min_swc_df)
         
         # Calculate moisture rate modifier
-        if soil_water_deficit[0] > SMD1bar:
-            return ModelConstants.RMF_MOISTURE_MAX
+        if swd > SMD1bar:
+            return RMF_MOISTURE_MAX, swd
         else:
-            return (ModelConstants.RMF_MOISTURE_MIN + 
-                   (ModelConstants.RMF_MOISTURE_MAX - ModelConstants.RMF_MOISTURE_MIN) * 
-                   (SMDMaxAdj - soil_water_deficit[0]) / (SMDMaxAdj - SMD1bar))
+            return (RMF_MOISTURE_MIN + _RMF_MOISTURE_RANGE * 
+                   (SMDMaxAdj - swd) / (SMDMaxAdj - SMD1bar)), swd
     
     @staticmethod
     def calculate_plant_cover_factor(plant_cover: int) -> float:
@@ -89,6 +97,6 @@ class RateModifiers:
             Plant cover rate modifier (0.6 or 1.0)
         """
         if plant_cover == 0:
-            return ModelConstants.RMF_PLANT_COVER_BARE
+            return RMF_PLANT_COVER_BARE
         else:
-            return ModelConstants.RMF_PLANT_COVER_VEGETATED
+            return RMF_PLANT_COVER_VEGETATED
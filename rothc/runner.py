@@ -2,14 +2,27 @@
 Model runner for executing RothC simulations.
 """
 
+import math
 import os
-from typing import List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple, Union
 import numpy as np
 import pandas as pd
 
 from .constants import ModelConstants
-from .data_structures import CarbonPools, SoilProperties, ClimateData, CarbonInputs
+from .data_handler import DataHandler, RESULT_COLUMNS, INPUT_DTYPES
+from .data_structures import CarbonPools, SoilProperties, POOL_IOM, POOL_SOC
 from .model import RothCModel
+from ._kernels import (
+    NUMBA_AVAILABLE, _compile_equilibrium, _equilibrium, _equilibrium_batch,
+    _moisture_factors, _simulate, _simulate_batch, _simulate_site
+)
+
+
+# Per-timestep input columns of the ``inputs`` array given to run_batch and
+# run_simulation_batch
+BATCH_INPUT_COLUMNS = ['t_mod', 't_tmp', 't_rain', 't_evap',
+                       't_C_Inp', 't_FYM_Inp', 't_PC', 't_DPM_RPM']
 
 
 class ModelRunner:
@@ -20,27 +33,65 @@ class ModelRunner:
         Initialize model runner.
         
         Args:
-            input_directory: Directory containing input files (optional)
+            input_directory: Directory containing input and output files
+                (optional, defaults to the current directory)
         """
         self.input_directory = input_directory
-        if input_directory:
-            os.chdir(input_directory)
     
-    def initialize_pools(self, iom_value: float) -> CarbonPools:
+    def _path(self, filename: str) -> str:
+        """Resolve a file name against the input directory."""
+        if self.input_directory:
+            return os.path.join(self.input_directory, filename)
+        return filename
+    
+    def load_input_data(
+        self,
+        input_file: str = 'RothC_input.dat'
+    ) -> Tuple[pd.DataFrame, SoilProperties, float, int]:
+        """
+        Load an input file from the input directory.
+        
+        See ``DataHandler.load_input_data``.
+        """
+        return DataHandler.load_input_data(self._path(input_file))
+    
+    def save_results(
+        self,
+        year_results: Union[np.ndarray, List[List]],
+        month_results: Union[np.ndarray, List[List]],
+        year_output_file: str = 'year_results.csv',
+        month_output_file: str = 'month_results.csv'
+    ) -> None:
+        """
+        Save results to CSV files in the input directory.
+        
+        See ``DataHandler.save_results``.
+        """
+        DataHandler.save_results(year_results, month_results,
+                                 self._path(year_output_file),
+                                 self._path(month_output_file))
+    
+    @staticmethod
+    def initialize_pools(
+        iom_value: float,
+        dtype: np.dtype = np.float64
+    ) -> CarbonPools:
         """
         Initialize carbon pools to zero (except IOM).
         
         Args:
             iom_value: Initial inert organic matter value
+            dtype: Precision of the pool state vector
             
         Returns:
             Initialized carbon pools
         """
         return CarbonPools(
-            DPM=[0.0], RPM=[0.0], BIO=[0.0], HUM=[0.0], 
-            IOM=[iom_value], SOC=[0.0],
-            DPM_Rage=[0.0], RPM_Rage=[0.0], BIO_Rage=[0.0], 
-            HUM_Rage=[0.0], IOM_Rage=[50000.0], Total_Rage=[0.0]
+            DPM=0.0, RPM=0.0, BIO=0.0, HUM=0.0, 
+            IOM=iom_value, SOC=0.0,
+            DPM_Rage=0.0, RPM_Rage=0.0, BIO_Rage=0.0, 
+            HUM_Rage=0.0, IOM_Rage=50000.0, Total_Rage=0.0,
+            dtype=dtype
         )
     
     def run_to_equilibrium(
@@ -49,7 +100,8 @@ class ModelRunner:
         pools: CarbonPools,
         df: pd.DataFrame,
         soil: SoilProperties,
-        tolerance: float = ModelConstants.EQUILIBRIUM_TOLERANCE
+        tolerance: float = ModelConstants.EQUILIBRIUM_TOLERANCE,
+        verbose: bool = True
     ) -> int:
         """
         Run model to equilibrium state.
@@ -59,67 +111,169 @@ class ModelRunner:
             pools: Carbon pools (modified in place)
             df: Input data frame
             soil: Soil properties
-            tolerance: Convergence tolerance
+            tolerance: Largest relative change of the DPM, RPM, BIO and HUM
+                pools, their radiocarbon ages and the total radiocarbon age
+                between consecutive years below which the model has
+                converged
+            verbose: Print the initial and equilibrium states
             
         Returns:
             Number of iterations to reach equilibrium
+        
+        A warning is printed if the iteration limit is reached, or if the
+        state becomes non-finite (for example from missing input data),
+        which ends the spin-up early.
         """
-        soil_water_deficit = [0.0]
         pools.update_total_soc()
         
-        print(f"Initial state: DPM={pools.DPM[0]:.4f}, RPM={pools.RPM[0]:.4f}, "
-              f"BIO={pools.BIO[0]:.4f}, HUM={pools.HUM[0]:.4f}, "
-              f"IOM={pools.IOM[0]:.4f}, SOC={pools.SOC[0]:.4f}")
-        
-        k = 0  # Index for cycling through yearly data
-        j = 0  # Total iteration counter
-        toc_previous = 0.0
-        test = 100.0
-        
-        while test > tolerance:
-            # Get data for this timestep
-            climate = ClimateData(
-                temperature=df.t_tmp[k],
-                rainfall=df.t_rain[k],
-                evaporation=df.t_evap[k]
-            )
-            
-            inputs = CarbonInputs(
-                plant_carbon=df.t_C_Inp[k],
-                fym_carbon=df.t_FYM_Inp[k],
-                dpm_rpm_ratio=df.t_DPM_RPM[k],
-                plant_cover=int(df.t_PC[k]),
-                modern_carbon=df.t_mod[k] / 100.0
-            )
-            
-            # Run one timestep
-            model.run_timestep(pools, climate, inputs, soil, soil_water_deficit)
-            
-            # Check for convergence at end of each year
-            if (k + 1) % model.time_factor == 0:
-                toc_current = pools.DPM[0] + pools.RPM[0] + pools.BIO[0] + pools.HUM[0]
-                test = abs(toc_current - toc_previous)
-                toc_previous = toc_current
-                k = 0  # Reset to beginning of year
-            else:
-                k += 1
-            
-            j += 1
-            
+        if verbose:
+            print(f"Initial state: DPM={pools.DPM:.4f}, RPM={pools.RPM:.4f}, "
+                  f"BIO={pools.BIO:.4f}, HUM={pools.HUM:.4f}, "
+                  f"IOM={pools.IOM:.4f}, SOC={pools.SOC:.4f}")
+        
+        # Extract the yearly cycle of input data once as contiguous arrays
+        (_, _, mod, tmp, rain, evap, c_inp, fym, pc,
+         dpm_rpm) = _extract_inputs(df, slice(0, model.time_factor))
+        
+        max_iterations = ModelConstants.MAX_EQUILIBRIUM_ITERATIONS
+        
+        equilibrium = _compile_equilibrium(model.time_factor)
+        j = equilibrium(
+            tmp, rain, evap, c_inp, fym, pc, dpm_rpm, mod, pools.state,
+            soil.smd_max_adj, soil.smd_1bar, soil.smd_bare,
+            soil.bio_fraction, soil.hum_fraction, tolerance, max_iterations
+        )
+        
+        if not np.all(np.isfinite(pools.state)):
+            print("Warning: Equilibrium state is not finite, "
+                  "check the input data")
+        elif j > max_iterations:
             # Safety check to prevent infinite loops
-            if j > 1000000:
-                print("Warning: Maximum iterations reached before convergence")
-                break
+            print("Warning: Maximum iterations reached before convergence")
         
-        total_delta = (np.exp(-pools.Total_Rage[0] / 8035.0) - 1.0) * 1000.0
-        print(f"\nEquilibrium reached after {j} iterations:")
-        print(f"DPM={pools.DPM[0]:.4f}, RPM={pools.RPM[0]:.4f}, "
-              f"BIO={pools.BIO[0]:.4f}, HUM={pools.HUM[0]:.4f}, "
-              f"IOM={pools.IOM[0]:.4f}, SOC={pools.SOC[0]:.4f}, "
-              f"Delta14C={total_delta:.2f}")
+        if verbose:
+            total_delta = (math.exp(-pools.Total_Rage /
+                                    ModelConstants.DELTA14C_MEAN_LIFE)
+                           - 1.0) * 1000.0
+            print(f"\nEquilibrium reached after {j} iterations:")
+            print(f"DPM={pools.DPM:.4f}, RPM={pools.RPM:.4f}, "
+                  f"BIO={pools.BIO:.4f}, HUM={pools.HUM:.4f}, "
+                  f"IOM={pools.IOM:.4f}, SOC={pools.SOC:.4f}, "
+                  f"Delta14C={total_delta:.2f}")
         
         return j
     
+    def run_batch(
+        self,
+        model: RothCModel,
+        states: np.ndarray,
+        soils: np.ndarray,
+        inputs: np.ndarray,
+        tolerance: float = ModelConstants.EQUILIBRIUM_TOLERANCE,
+        dtype: np.dtype = np.float64
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Run many independent sites to equilibrium in parallel.
+        
+        With Numba the sites are spread over all cores by a parallel
+        kernel; without it a process pool runs one site per task.
+        
+        The process pool starts fresh interpreters on platforms that use
+        the "spawn" start method (Windows, macOS), and those re-import
+        the calling script. A script that calls this without Numba must
+        therefore do so under an ``if __name__ == "__main__":`` guard.
+        
+        Args:
+            model: RothC model instance
+            states: (n_sites, N_POOLS) initial ``CarbonPools.state`` vectors
+            soils: (n_sites, 2) clay (%) and depth (cm) per site
+            inputs: (n_sites, time_factor, 8) yearly input data per site,
+                with columns as in ``BATCH_INPUT_COLUMNS``
+            tolerance: Convergence tolerance
+            dtype: Precision in which states and inputs are stored. float32
+                is storage only: it halves the memory of large batches, but
+                the arithmetic and the convergence test are carried out in
+                float64, so it does not speed up the computation
+            
+        Returns:
+            Tuple of (equilibrium states, iterations per site). A site whose
+            state becomes non-finite stops early and keeps that state, so
+            ``np.isfinite(states).all(axis=1)`` flags failed sites
+        """
+        states, soil_params, inputs = _batch_arrays(states, soils, inputs,
+                                                    dtype)
+        
+        decomp = model.decomp_model
+        args = (decomp.exc, decomp.conr, decomp.time_step, model.time_factor,
+                tolerance, ModelConstants.MAX_EQUILIBRIUM_ITERATIONS)
+        iterations = np.zeros(len(states), dtype=np.int64)
+        
+        if NUMBA_AVAILABLE:
+            _equilibrium_batch(inputs, states, soil_params, *args, iterations)
+        else:
+            with ProcessPoolExecutor() as executor:
+                results = executor.map(
+                    _equilibrium_site,
+                    inputs, states, soil_params, [args] * len(states)
+                )
+                for s, (state, j) in enumerate(results):
+                    states[s] = state
+                    iterations[s] = j
+        
+        return states, iterations
+    
+    def run_simulation_batch(
+        self,
+        model: RothCModel,
+        states: np.ndarray,
+        soils: np.ndarray,
+        inputs: np.ndarray,
+        dtype: np.dtype = np.float64
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Run many independent sites forward in parallel.
+        
+        The batch counterpart of ``run_simulation``, for spatial or
+        Monte-Carlo runs. Sites are distributed as in ``run_batch``, and
+        without Numba the same ``if __name__ == "__main__":`` guard is
+        needed on "spawn" platforms.
+        
+        Args:
+            model: RothC model instance
+            states: (n_sites, N_POOLS) initial ``CarbonPools.state`` vectors,
+                e.g. the equilibrium states returned by ``run_batch``
+            soils: (n_sites, 2) clay (%) and depth (cm) per site
+            inputs: (n_sites, n_steps, 8) input data per site, with columns
+                as in ``BATCH_INPUT_COLUMNS``
+            dtype: Precision in which states and inputs are stored, as in
+                ``run_batch``
+            
+        Returns:
+            Tuple of (final states, results), where results has shape
+            (n_sites, n_steps, 7) with the pool columns of
+            ``RESULT_COLUMNS`` (DPM to deltaC) after every timestep
+        """
+        states, soil_params, inputs = _batch_arrays(states, soils, inputs,
+                                                    dtype)
+        
+        decomp = model.decomp_model
+        args = (decomp.exc, decomp.conr, decomp.time_step)
+        results = np.empty(inputs.shape[:2] + (len(RESULT_COLUMNS) - 2,))
+        
+        if NUMBA_AVAILABLE:
+            _simulate_batch(inputs, states, soil_params, *args, results)
+        else:
+            with ProcessPoolExecutor() as executor:
+                site_results = executor.map(
+                    _simulate_site_worker,
+                    inputs, states, soil_params, [args] * len(states)
+                )
+                for s, (state, site) in enumerate(site_results):
+                    states[s] = state
+                    results[s] = site
+        
+        return states, results
+    
     def run_simulation(
         self,
         model: RothCModel,
@@ -128,8 +282,9 @@ class ModelRunner:
         soil: SoilProperties,
         start_step: int,
         n_steps: int,
-        verbose: bool = True
-    ) -> Tuple[List[List], List[List]]:
+        verbose: bool = True,
+        print_interval: int = 100
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """
         Run model simulation for specified time period.
         
@@ -140,65 +295,175 @@ class ModelRunner:
             soil: Soil properties
             start_step: Starting timestep index
             n_steps: Total number of timesteps
-            verbose: Print progress information
+            verbose: Print SOC as each simulated year finishes
+            print_interval: Print SOC every this many simulated years,
+                starting with the first
             
         Returns:
-            Tuple of (year_results, month_results)
-        """
-        soil_water_deficit = [0.0]
-        month_results = []
-        year_results = []
-        
-        for i in range(start_step, n_steps):
-            # Get data for this timestep
-            climate = ClimateData(
-                temperature=df.t_tmp[i],
-                rainfall=df.t_rain[i],
-                evaporation=df.t_evap[i]
-            )
+            Tuple of (year_results, month_results) arrays with one row per
+            output and columns as in ``RESULT_COLUMNS``
             
-            inputs = CarbonInputs(
-                plant_carbon=df.t_C_Inp[i],
-                fym_carbon=df.t_FYM_Inp[i],
-                dpm_rpm_ratio=df.t_DPM_RPM[i],
-                plant_cover=int(df.t_PC[i]),
-                modern_carbon=df.t_mod[i] / 100.0
+        Raises:
+            ValueError: If ``print_interval`` is less than 1
+        """
+        if print_interval < 1:
+            raise ValueError(
+                f"print_interval must be at least 1, got {print_interval}")
+        
+        (years, months, mod, tmp, rain, evap, c_inp, fym, pc,
+         dpm_rpm) = _extract_inputs(df, slice(start_step, n_steps))
+        
+        # Rate modifiers and decay factors for every timestep at once
+        rm_temp, rm_pc = _precompute_rate_modifiers(tmp, pc)
+        rm_moist = _moisture_factors(rain, evap, pc, soil.smd_max_adj,
+                                     soil.smd_1bar, soil.smd_bare)
+        dpm_f, rpm_f, bio_f, hum_f = model.decomp_model.precompute(
+            rm_temp * rm_moist * rm_pc)
+        
+        # Pool recurrence, written straight into the monthly results
+        month_results = np.empty((len(tmp), len(RESULT_COLUMNS)))
+        month_results[:, 0] = years
+        month_results[:, 1] = months
+        
+        def simulate(rows):
+            _simulate(
+                dpm_f[rows], rpm_f[rows], bio_f[rows], hum_f[rows],
+                c_inp[rows], fym[rows], dpm_rpm[rows], mod[rows], pools.state,
+                soil.bio_fraction, soil.hum_fraction,
+                model.decomp_model.exc, model.decomp_model.conr,
+                month_results[rows]
             )
-            
-            # Run one timestep
-            model.run_timestep(pools, climate, inputs, soil, soil_water_deficit)
-            
-            # Calculate delta 14C
-            total_delta = (np.exp(-pools.Total_Rage[0] / 8035.0) - 1.0) * 1000.0
-            
-            # Store monthly results
-            month_results.append([
-                int(df.loc[i, "t_year"]),
-                int(df.loc[i, "t_month"]),
-                pools.DPM[0],
-                pools.RPM[0],
-                pools.BIO[0],
-                pools.HUM[0],
-                pools.IOM[0],
-                pools.SOC[0],
-                total_delta
-            ])
-            
-            # Store yearly results (at end of year)
-            if df.t_month[i] == model.time_factor:
-                year_results.append([
-                    int(df.loc[i, "t_year"]),
-                    int(df.loc[i, "t_month"]),
-                    pools.DPM[0],
-                    pools.RPM[0],
-                    pools.BIO[0],
-                    pools.HUM[0],
-                    pools.IOM[0],
-                    pools.SOC[0],
-                    total_delta
-                ])
-                
-                if verbose:
-                    print(f"Year {int(df.loc[i, 't_year'])}: SOC={pools.SOC[0]:.4f} t C/ha")
+        
+        year_ends = np.flatnonzero(months == model.time_factor)
+        
+        if verbose:
+            # One kernel call per year, so each year is reported as it ends
+            start = 0
+            for n, end in enumerate(year_ends + 1):
+                simulate(slice(start, end))
+                start = end
+                if n % print_interval == 0:
+                    row = month_results[end - 1]
+                    print(f"Year {int(row[0])}: SOC={row[7]:.4f} t C/ha",
+                          flush=True)
+            simulate(slice(start, len(tmp)))
+        else:
+            simulate(slice(0, len(tmp)))
+        
+        # Yearly results (at end of year)
+        year_results = month_results[year_ends]
         
         return year_results, month_results
+
+
+def _equilibrium_site(
+    inputs: np.ndarray,
+    state: np.ndarray,
+    soil_params: np.ndarray,
+    args: tuple
+) -> Tuple[np.ndarray, int]:
+    """Run one site of a batch to equilibrium (process pool worker)."""
+    j = _equilibrium(
+        inputs[:, 1], inputs[:, 2], inputs[:, 3], inputs[:, 4], inputs[:, 5],
+        inputs[:, 6], inputs[:, 7], inputs[:, 0], state, *soil_params, *args
+    )
+    return state, j
+
+
+def _simulate_site_worker(
+    inputs: np.ndarray,
+    state: np.ndarray,
+    soil_params: np.ndarray,
+    args: tuple
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Run one site of a batch forward (process pool worker)."""
+    results = np.empty((len(inputs), len(RESULT_COLUMNS) - 2))
+    _simulate_site(inputs, state, *soil_params, *args, results)
+    return state, results
+
+
+def _batch_arrays(
+    states: np.ndarray,
+    soils: np.ndarray,
+    inputs: np.ndarray,
+    dtype: np.dtype
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Prepare the per-site arrays of a batch run.
+    
+    Returns:
+        Tuple of (states with total SOC set, (n_sites, 5) soil parameters,
+        inputs with modern carbon as a fraction), all as new arrays
+    """
+    states = np.array(states, dtype=dtype)
+    inputs = np.array(inputs, dtype=dtype)
+    inputs[:, :, 0] /= 100.0  # percent modern -> fraction modern
+    
+    soil_params = np.array([
+        [soil.smd_max_adj, soil.smd_1bar, soil.smd_bare,
+         soil.bio_fraction, soil.hum_fraction]
+        for soil in (SoilProperties(clay=c, depth=d) for c, d in soils)
+    ]).reshape(len(states), 5)
+    
+    for state in states:
+        state[POOL_SOC] = state[:POOL_IOM + 1].sum()
+    
+    return states, soil_params, inputs
+
+
+def _extract_inputs(df: pd.DataFrame, rows: slice) -> Tuple[np.ndarray, ...]:
+    """
+    Extract input columns as NumPy arrays.
+    
+    Columns already parsed with ``INPUT_DTYPES`` are returned as views
+    without copying.
+    
+    Args:
+        df: Input data frame
+        rows: Timesteps to extract
+        
+    Returns:
+        Tuple of (year, month, modern carbon fraction, temperature, rainfall,
+        evaporation, plant carbon, FYM carbon, plant cover, DPM/RPM ratio)
+    """
+    def column(name):
+        return df[name].to_numpy(dtype=INPUT_DTYPES[name])[rows]
+    
+    return (
+        column('t_year'),
+        column('t_month'),
+        column('t_mod') / 100.0,
+        column('t_tmp'),
+        column('t_rain'),
+        column('t_evap'),
+        column('t_C_Inp'),
+        column('t_FYM_Inp'),
+        column('t_PC'),
+        column('t_DPM_RPM'),
+    )
+
+
+def _precompute_rate_modifiers(
+    temperature: np.ndarray,
+    plant_cover: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorised temperature and plant cover rate modifiers.
+    
+    Args:
+        temperature: Air temperature for each timestep (°C)
+        plant_cover: Plant cover flag for each timestep (0=bare, 1=vegetated)
+        
+    Returns:
+        Tuple of (temperature factors, plant cover factors)
+    """
+    # Evaluated at max(T, -5) and masked, so no out-of-range exponentials
+    rm_temp = (temperature >= -5.0) * 47.91 / (
+        np.exp(106.06 / (np.maximum(temperature, -5.0) + 18.27)) + 1.0
+    )
+    rm_pc = np.where(
+        plant_cover == 0,
+        ModelConstants.RMF_PLANT_COVER_BARE,
+        ModelConstants.RMF_PLANT_COVER_VEGETATED
+    )
+    return rm_temp, rm_pc
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Run the RothC model for many sites in parallel.
+
+Each site is a directory containing its own RothC_input.dat. The sites
+are independent, so they are spread over a process pool, and each
+worker writes year_results.csv and month_results.csv into its site
+directory.
+
+Usage:
+    python run_many.py SITE_DIR [SITE_DIR ...]
+"""
+
+import os
+import sys
+from multiprocessing import Pool
+
+from rothc import ModelRunner
+from run_rothc import run_one
+
+
+def run_site(input_directory: str):
+    """
+    Run one site and save its results next to its input file.
+    
+    Returns:
+        Tuple of (input directory, equilibrium SOC, final SOC)
+    """
+    runner = ModelRunner(input_directory)
+    year_results, month_results = run_one(runner, verbose=False)
+    runner.save_results(year_results, month_results)
+    return input_directory, year_results[0, 7], year_results[-1, 7]
+
+
+def main(site_directories):
+    """Main execution function."""
+    if not site_directories:
+        print(__doc__.strip())
+        return 1
+    
+    processes = min(os.cpu_count() or 1, len(site_directories))
+    print(f"Running {len(site_directories)} sites on {processes} processes...")
+    
+    with Pool(processes) as pool:
+        for directory, soc_equilibrium, soc_final in pool.imap(
+                run_site, site_directories):
+            print(f"{directory}: equilibrium SOC={soc_equilibrium:.4f}, "
+                  f"final SOC={soc_final:.4f} t C/ha")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
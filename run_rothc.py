@@ -5,70 +5,96 @@ Main execution script for RothC model.
 This script runs the RothC soil carbon model simulation.
 """
 
+import math
 import os
 import numpy as np
 
 from rothc import (
     RothCModel,
     ModelRunner,
-    DataHandler
+    ModelConstants
 )
 
 
-def main():
-    """Main execution function."""
+def run_one(runner: ModelRunner, verbose: bool = True):
+    """
+    Run equilibrium and simulation for the input file of one runner.
     
-    print("="*80)
-    print("RothC Python Model - Modular Version")
-    print("="*80)
-    print()
-    
-    # Set up paths
-    print(f"Current working directory: {os.getcwd()}")
-    
-    # Uncomment and modify the following line to change to your data directory:
-    # os.chdir("/path/to/your/data/directory")
+    Args:
+        runner: Model runner whose input directory holds RothC_input.dat
+        verbose: Print progress information
+        
+    Returns:
+        Tuple of (year_results, month_results) arrays, where the first
+        year row holds the equilibrium state and its iteration count
+    """
+    def log(*args):
+        if verbose:
+            print(*args)
     
     # Load input data
-    print("Loading input data...")
-    df, soil, iom_initial, nsteps = DataHandler.load_input_data('RothC_input.dat')
-    print(f"Loaded {len(df)} timesteps")
-    print(f"Soil properties: clay={soil.clay}%, depth={soil.depth}cm")
-    print(f"Initial IOM: {iom_initial} t C/ha")
-    print()
+    log("Loading input data...")
+    df, soil, iom_initial, nsteps = runner.load_input_data('RothC_input.dat')
+    log(f"Loaded {len(df)} timesteps")
+    log(f"Soil properties: clay={soil.clay}%, depth={soil.depth}cm")
+    log(f"Initial IOM: {iom_initial} t C/ha")
+    log()
     
     # Initialize model and pools
     time_factor = 12  # Monthly timesteps
     model = RothCModel(time_factor=time_factor)
-    runner = ModelRunner()
     pools = runner.initialize_pools(iom_initial)
     
     # Run to equilibrium
-    print("Running to equilibrium...")
-    print("-" * 80)
-    equilibrium_iterations = runner.run_to_equilibrium(model, pools, df, soil)
-    print()
+    log("Running to equilibrium...")
+    log("-" * 80)
+    equilibrium_iterations = runner.run_to_equilibrium(
+        model, pools, df, soil, verbose=verbose
+    )
+    log()
     
     # Store equilibrium results
-    total_delta = (np.exp(-pools.Total_Rage[0] / 8035.0) - 1.0) * 1000.0
-    year_results = [[1, equilibrium_iterations, pools.DPM[0], pools.RPM[0], 
-                    pools.BIO[0], pools.HUM[0], pools.IOM[0], pools.SOC[0], 
-                    total_delta]]
+    total_delta = (math.exp(-pools.Total_Rage /
+                            ModelConstants.DELTA14C_MEAN_LIFE) - 1.0) * 1000.0
+    equilibrium_row = [1, equilibrium_iterations, pools.DPM, pools.RPM, 
+                       pools.BIO, pools.HUM, pools.IOM, pools.SOC, 
+                       total_delta]
     
     # Run simulation
-    print("Running simulation...")
-    print("-" * 80)
+    log("Running simulation...")
+    log("-" * 80)
     year_sim, month_sim = runner.run_simulation(
-        model, pools, df, soil, time_factor, nsteps, verbose=True
+        model, pools, df, soil, time_factor, nsteps, verbose=verbose
     )
     
     # Combine results
-    year_results.extend(year_sim)
+    year_results = np.vstack([equilibrium_row, year_sim])
+    
+    return year_results, month_sim
+
+
+def main():
+    """Main execution function."""
+    
+    print("="*80)
+    print("RothC Python Model - Modular Version")
+    print("="*80)
+    print()
+    
+    # Set up paths
+    print(f"Current working directory: {os.getcwd()}")
+    
+    # Pass your data directory here to read and write files there instead:
+    # runner = ModelRunner("/path/to/your/data/directory")
+    runner = ModelRunner()
+    
+    year_results, month_results = run_one(runner)
     
     # Save results
     print()
     print("Saving results...")
-    DataHandler.save_results(year_results, month_sim)
+    runner.save_results(year_results, month_results)
+    print("Results saved to year_results.csv and month_results.csv")
     
     print()
     print("="*80)
@@ -35,6 +35,9 @@ setup(
         "pandas>=1.1.0",
     ],
     extras_require={
+        "fast": [
+            "numba>=0.55",
+        ],
         "dev": [
             "pytest>=6.0",
             "pytest-cov>=2.0",
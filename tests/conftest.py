@@ -0,0 +1,30 @@
+"""
+Shared fixtures for the RothC tests.
+"""
+
+import os
+
+import pytest
+
+from rothc import ModelRunner, RothCModel
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def runner():
+    """Model runner reading the shipped RothC_input.dat."""
+    return ModelRunner(REPO_ROOT)
+
+
+@pytest.fixture
+def model():
+    """Monthly RothC model."""
+    return RothCModel(time_factor=12)
+
+
+@pytest.fixture
+def site(runner):
+    """Tuple of (data frame, soil, initial IOM, nsteps) of the shipped input."""
+    return runner.load_input_data('RothC_input.dat')
@@ -0,0 +1,32 @@
+"""
+Result files written by the data handler.
+"""
+
+import numpy as np
+import pandas as pd
+
+from rothc import DataHandler
+from rothc.data_handler import RESULT_COLUMNS
+
+
+def test_results_read_back_exactly_in_shortest_form(tmp_path):
+    rng = np.random.default_rng(0)
+    results = np.column_stack([np.arange(1, 6), np.full(5, 12),
+                               rng.uniform(0.0, 100.0, (5, 7))])
+    results[0, 2:] = [0.1, 1.0, 2.5e-5, 1e22, -93.35, 0.0, 50000.0]
+    year_file = tmp_path / 'year.csv'
+    month_file = tmp_path / 'month.csv'
+    
+    DataHandler.save_results(results, results[:2], str(year_file),
+                             str(month_file))
+    
+    lines = year_file.read_text().splitlines()
+    assert lines[0] == ','.join(RESULT_COLUMNS)
+    assert lines[1] == '1,12,0.1,1.0,2.5e-05,1e+22,-93.35,0.0,50000.0'
+    
+    year = pd.read_csv(year_file, float_precision='round_trip')
+    month = pd.read_csv(month_file, float_precision='round_trip')
+    assert list(year.columns) == RESULT_COLUMNS
+    assert year['Year'].dtype.kind == 'i'
+    np.testing.assert_array_equal(year.to_numpy(), results)
+    np.testing.assert_array_equal(month.to_numpy(), results[:2])
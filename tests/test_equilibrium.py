@@ -0,0 +1,178 @@
+"""
+Regression tests for the equilibrium spin-up.
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from rothc import ModelConstants, ModelRunner, SoilProperties
+from rothc.runner import BATCH_INPUT_COLUMNS
+
+
+POOLS = ['DPM', 'RPM', 'BIO', 'HUM', 'SOC']
+
+# Equilibrium row of year_results.csv written by the original
+# implementation (absolute test on total carbon, no extrapolation)
+BASELINE = {
+    'DPM': 0.14546618698414288,
+    'RPM': 5.67812085875245,
+    'BIO': 0.7405937979752076,
+    'HUM': 27.642769420830824,
+    'SOC': 37.21105026454263,
+    'Delta14C': -93.34988833305691,
+}
+
+# Fixed point of the yearly cycle of the shipped input, from a spin-up
+# converged to a relative tolerance of 1e-14
+FIXED_POINT = {
+    'DPM': 0.14546618698414296,
+    'RPM': 5.678120858752469,
+    'BIO': 0.7405942227238748,
+    'HUM': 27.64290300236379,
+    'SOC': 37.211184270824276,
+    'Delta14C': -93.35027122600559,
+}
+
+# Number of random sites checked against plain yearly cycling
+N_SITES = 100
+
+# Plain cycling is taken as converged when a year changes no part of the
+# state by more than this, relative
+CYCLING_TOLERANCE = 1e-13
+
+
+def _equilibrium(runner, model, site, **kwargs):
+    df, soil, iom, _ = site
+    pools = runner.initialize_pools(iom)
+    iterations = runner.run_to_equilibrium(model, pools, df, soil,
+                                           verbose=False, **kwargs)
+    values = {name: getattr(pools, name) for name in POOLS}
+    values['Delta14C'] = (math.exp(-pools.Total_Rage /
+                                   ModelConstants.DELTA14C_MEAN_LIFE)
+                          - 1.0) * 1000.0
+    return iterations, values
+
+
+def test_default_tolerance_is_at_least_as_close_as_baseline(runner, model,
+                                                            site):
+    iterations, values = _equilibrium(runner, model, site)
+    
+    assert iterations < ModelConstants.MAX_EQUILIBRIUM_ITERATIONS
+    for name, value in values.items():
+        baseline_error = abs(BASELINE[name] - FIXED_POINT[name])
+        assert abs(value - FIXED_POINT[name]) <= baseline_error + 1e-12, name
+
+
+def test_default_tolerance_matches_baseline(runner, model, site):
+    _, values = _equilibrium(runner, model, site)
+    
+    for name, value in values.items():
+        assert value == pytest.approx(BASELINE[name], rel=1e-5), name
+
+
+def test_tighter_tolerance_approaches_fixed_point(runner, model, site):
+    _, values = _equilibrium(runner, model, site, tolerance=1e-12)
+    
+    for name, value in values.items():
+        assert value == pytest.approx(FIXED_POINT[name], rel=1e-8), name
+
+
+def test_totals_match_pools_at_iteration_limit(runner, model, site,
+                                               monkeypatch):
+    """Stopping right after an extrapolated year leaves consistent totals."""
+    monkeypatch.setattr(ModelConstants, 'MAX_EQUILIBRIUM_ITERATIONS', 12)
+    df, soil, iom, _ = site
+    pools = runner.initialize_pools(iom)
+    
+    iterations = runner.run_to_equilibrium(model, pools, df, soil,
+                                           verbose=False)
+    
+    assert iterations == 24
+    carbon = [pools.DPM, pools.RPM, pools.BIO, pools.HUM, pools.IOM]
+    ages = [pools.DPM_Rage, pools.RPM_Rage, pools.BIO_Rage, pools.HUM_Rage,
+            pools.IOM_Rage]
+    conr = model.decomp_model.conr
+    radioactive = sum(c * math.exp(-conr * age) for c, age in zip(carbon, ages))
+    assert pools.SOC == pytest.approx(sum(carbon), rel=1e-14)
+    assert pools.Total_Rage == pytest.approx(
+        math.log(pools.SOC / radioactive) / conr, rel=1e-12)
+
+
+def _cycle(model, state, soil, year, block=2000):
+    """Cycle ``year`` (batch input rows) until the state stops changing."""
+    pools = ModelRunner.initialize_pools(0.0)
+    pools.state[:] = state
+    
+    def run(rows, swd):
+        mod, tmp, rain, evap, c_inp, fym, pc, dpm_rpm = rows.T
+        return model.run_timesteps(pools, tmp, rain, evap, c_inp, fym,
+                                   dpm_rpm, pc, mod / 100.0, soil, swd)
+    
+    swd = 0.0
+    blocks = np.tile(year, (block, 1))
+    while True:
+        swd = run(blocks, swd)
+        previous = pools.state.copy()
+        swd = run(year, swd)
+        change = np.abs(pools.state - previous) / np.abs(pools.state)
+        if change.max() < CYCLING_TOLERANCE:
+            return pools.state.copy()
+
+
+def _random_sites(df, iom, n, seed=0):
+    """Soils, year inputs and initial states spread over plausible sites."""
+    rng = np.random.default_rng(seed)
+    soils = np.column_stack([rng.uniform(2.0, 70.0, n),
+                             rng.uniform(10.0, 50.0, n)])
+    year = df[BATCH_INPUT_COLUMNS].to_numpy(dtype=np.float64)[:12]
+    inputs = np.repeat(year[None], n, axis=0)
+    inputs[:, :, 4] *= rng.uniform(0.05, 5.0, n)[:, None]
+    inputs[:, :, 1] += rng.uniform(-8.0, 12.0, n)[:, None]
+    inputs[:, :, 2] *= rng.uniform(0.1, 3.0, n)[:, None]
+    states = np.stack([ModelRunner.initialize_pools(iom).state
+                       for _ in range(n)])
+    return soils, inputs, states
+
+
+def test_spin_up_matches_plain_yearly_cycling(runner, model, site):
+    """The extrapolated spin-up reaches the state of plain cycling."""
+    df, soil, iom, _ = site
+    pools = runner.initialize_pools(iom)
+    runner.run_to_equilibrium(model, pools, df, soil, tolerance=1e-12,
+                              verbose=False)
+    
+    year = df[BATCH_INPUT_COLUMNS].to_numpy(dtype=np.float64)[:12]
+    cycled = _cycle(model, runner.initialize_pools(iom).state, soil, year)
+    
+    np.testing.assert_allclose(pools.state, cycled, rtol=1e-6)
+
+
+def test_spin_up_matches_plain_cycling_across_sites(runner, model, site):
+    """Sites far from the shipped one converge to the same state as well."""
+    df, _, iom, _ = site
+    soils, inputs, states = _random_sites(df, iom, N_SITES)
+    
+    equilibria, iterations = runner.run_batch(model, states, soils, inputs)
+    
+    assert np.all(iterations < ModelConstants.MAX_EQUILIBRIUM_ITERATIONS)
+    for s in range(N_SITES):
+        soil = SoilProperties(clay=soils[s, 0], depth=soils[s, 1])
+        cycled = _cycle(model, states[s], soil, inputs[s])
+        np.testing.assert_allclose(equilibria[s], cycled, rtol=1e-7,
+                                   err_msg=f"site {s}")
+
+
+def test_non_finite_state_is_reported(runner, model, site, capsys):
+    """A NaN in the inputs stops the spin-up with a warning."""
+    df, soil, iom, _ = site
+    df = df.copy()
+    df.loc[0, 't_C_Inp'] = float('nan')
+    pools = runner.initialize_pools(iom)
+    
+    iterations = runner.run_to_equilibrium(model, pools, df, soil,
+                                           verbose=False)
+    
+    assert iterations == model.time_factor
+    assert "not finite" in capsys.readouterr().out
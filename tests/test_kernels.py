@@ -0,0 +1,199 @@
+"""
+Equivalence tests of the compiled kernels against reference stepping.
+
+The reference is the original single-file implementation in
+RothC_Py_refactored.py, stepped one month at a time.
+"""
+
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from rothc import CarbonInputs, ClimateData, ModelRunner, RateModifiers
+from rothc._kernels import NUMBA_AVAILABLE
+from rothc.runner import _extract_inputs
+
+from conftest import REPO_ROOT
+
+
+N_STEPS = 600
+
+
+def _load_reference():
+    spec = importlib.util.spec_from_file_location(
+        'RothC_Py_refactored', os.path.join(REPO_ROOT, 'RothC_Py_refactored.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _monthly_inputs(df, steps):
+    """Input columns, with FYM added every fifth month to cover that path."""
+    (_, _, mod, tmp, rain, evap, c_inp, fym, pc,
+     dpm_rpm) = _extract_inputs(df, slice(0, steps))
+    fym = fym + 0.1 * (np.arange(steps) % 5 == 0)
+    return mod, tmp, rain, evap, c_inp, fym, pc, dpm_rpm
+
+
+def _reference_run(site, steps=N_STEPS):
+    """Pool values after every month from the original implementation."""
+    ref = _load_reference()
+    df, soil, iom, _ = site
+    mod, tmp, rain, evap, c_inp, fym, pc, dpm_rpm = _monthly_inputs(df, steps)
+    
+    model = ref.RothCModel(time_factor=12)
+    ref_soil = ref.SoilProperties(clay=soil.clay, depth=soil.depth)
+    pools = ref.CarbonPools(
+        DPM=[0.0], RPM=[0.0], BIO=[0.0], HUM=[0.0], IOM=[iom], SOC=[0.0],
+        DPM_Rage=[0.0], RPM_Rage=[0.0], BIO_Rage=[0.0], HUM_Rage=[0.0],
+        IOM_Rage=[50000.0], Total_Rage=[0.0])
+    swd = [0.0]
+    
+    rows = []
+    for i in range(steps):
+        model.run_timestep(
+            pools, ref.ClimateData(tmp[i], rain[i], evap[i]),
+            ref.CarbonInputs(c_inp[i], fym[i], dpm_rpm[i], int(pc[i]),
+                             mod[i]),
+            ref_soil, swd)
+        rows.append([pools.DPM[0], pools.RPM[0], pools.BIO[0], pools.HUM[0],
+                     pools.IOM[0], pools.SOC[0], pools.DPM_Rage[0],
+                     pools.RPM_Rage[0], pools.BIO_Rage[0], pools.HUM_Rage[0],
+                     pools.Total_Rage[0]])
+    return np.array(rows)
+
+
+def _state_row(pools):
+    return [pools.DPM, pools.RPM, pools.BIO, pools.HUM, pools.IOM, pools.SOC,
+            pools.DPM_Rage, pools.RPM_Rage, pools.BIO_Rage, pools.HUM_Rage,
+            pools.Total_Rage]
+
+
+def _run_timestep_run(model, site, steps=N_STEPS):
+    df, soil, iom, _ = site
+    mod, tmp, rain, evap, c_inp, fym, pc, dpm_rpm = _monthly_inputs(df, steps)
+    
+    pools = ModelRunner.initialize_pools(iom)
+    swd = 0.0
+    rows = []
+    for i in range(steps):
+        swd = model.run_timestep(
+            pools, ClimateData(tmp[i], rain[i], evap[i]),
+            CarbonInputs(c_inp[i], fym[i], dpm_rpm[i], int(pc[i]), mod[i]),
+            soil, swd)
+        rows.append(_state_row(pools))
+    return np.array(rows)
+
+
+def test_run_timestep_matches_reference(model, site):
+    expected = _reference_run(site)
+    actual = _run_timestep_run(model, site)
+    
+    np.testing.assert_allclose(actual, expected, rtol=1e-10, atol=1e-12)
+
+
+def test_process_methods_match_run_timestep(model, site):
+    """Stepping through the individual processes gives run_timestep."""
+    df, soil, iom, _ = site
+    mod, tmp, rain, evap, c_inp, fym, pc, dpm_rpm = _monthly_inputs(df,
+                                                                   N_STEPS)
+    expected = _run_timestep_run(model, site)
+    
+    rm = RateModifiers()
+    decomp = model.decomp_model
+    pools = ModelRunner.initialize_pools(iom)
+    swd = 0.0
+    for i in range(N_STEPS):
+        rm_moist, swd = rm.calculate_moisture_factor(rain[i], evap[i], soil,
+                                                     int(pc[i]), swd)
+        rate = (rm.calculate_temperature_factor(tmp[i]) * rm_moist *
+                rm.calculate_plant_cover_factor(int(pc[i])))
+        decomp.run_decomposition(
+            pools, CarbonInputs(c_inp[i], fym[i], dpm_rpm[i], int(pc[i]),
+                                mod[i]),
+            rate, soil)
+        decomp.finalize_totals(pools)
+        np.testing.assert_allclose(_state_row(pools), expected[i],
+                                   rtol=1e-10, atol=1e-12)
+
+
+def test_run_timesteps_matches_run_timestep(model, site):
+    df, soil, iom, _ = site
+    mod, tmp, rain, evap, c_inp, fym, pc, dpm_rpm = _monthly_inputs(df,
+                                                                   N_STEPS)
+    expected = _run_timestep_run(model, site)[-1]
+    
+    pools = ModelRunner.initialize_pools(iom)
+    model.run_timesteps(pools, tmp, rain, evap, c_inp, fym, dpm_rpm, pc, mod,
+                        soil)
+    
+    np.testing.assert_allclose(_state_row(pools), expected, rtol=1e-12)
+
+
+def test_run_simulation_matches_run_timestep(runner, model, site):
+    df, soil, iom, nsteps = site
+    start = ModelRunner.initialize_pools(iom)
+    runner.run_to_equilibrium(model, start, df, soil, verbose=False)
+    
+    pools = ModelRunner.initialize_pools(iom)
+    pools.state[:] = start.state
+    year_results, month_results = runner.run_simulation(
+        model, pools, df, soil, 12, nsteps, verbose=False)
+    
+    (_, _, mod, tmp, rain, evap, c_inp, fym, pc,
+     dpm_rpm) = _extract_inputs(df, slice(12, nsteps))
+    reference = ModelRunner.initialize_pools(iom)
+    reference.state[:] = start.state
+    swd = 0.0
+    for i in range(len(tmp)):
+        swd = model.run_timestep(
+            reference, ClimateData(tmp[i], rain[i], evap[i]),
+            CarbonInputs(c_inp[i], fym[i], dpm_rpm[i], int(pc[i]), mod[i]),
+            soil, swd)
+        delta = (np.exp(-reference.Total_Rage / 8035.0) - 1.0) * 1000.0
+        np.testing.assert_allclose(
+            month_results[i, 2:],
+            [reference.DPM, reference.RPM, reference.BIO, reference.HUM,
+             reference.IOM, reference.SOC, delta],
+            rtol=1e-10, atol=1e-10)
+    
+    np.testing.assert_allclose(pools.state, reference.state, rtol=1e-10)
+    np.testing.assert_array_equal(year_results,
+                                  month_results[month_results[:, 1] == 12])
+
+
+@pytest.mark.skipif(not NUMBA_AVAILABLE, reason="Numba is not installed")
+def test_pure_python_kernels_match_numba(runner, model, site):
+    """The no-Numba fallback gives the same results as the compiled run."""
+    df, soil, iom, nsteps = site
+    pools = ModelRunner.initialize_pools(iom)
+    runner.run_to_equilibrium(model, pools, df, soil, verbose=False)
+    _, expected = runner.run_simulation(model, pools, df, soil, 12, nsteps,
+                                        verbose=False)
+    
+    script = (
+        "import json, sys\n"
+        "sys.modules['numba'] = None\n"
+        "sys.path.insert(0, sys.argv[1])\n"
+        "from rothc import ModelRunner, RothCModel\n"
+        "from rothc._kernels import NUMBA_AVAILABLE\n"
+        "assert not NUMBA_AVAILABLE\n"
+        "runner = ModelRunner(sys.argv[1]); model = RothCModel(12)\n"
+        "df, soil, iom, n = runner.load_input_data()\n"
+        "pools = runner.initialize_pools(iom)\n"
+        "runner.run_to_equilibrium(model, pools, df, soil, verbose=False)\n"
+        "_, month = runner.run_simulation(model, pools, df, soil, 12, n,\n"
+        "                                 verbose=False)\n"
+        "json.dump(month.tolist(), sys.stdout)\n"
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', script, REPO_ROOT],
+        check=True, capture_output=True, text=True).stdout
+    actual = np.array(json.loads(output))
+    
+    np.testing.assert_array_equal(actual, expected)
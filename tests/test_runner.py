@@ -0,0 +1,56 @@
+"""
+Progress output of the model runner.
+"""
+
+import numpy as np
+import pytest
+
+from rothc import ModelRunner
+
+
+def test_verbose_simulation_matches_quiet(runner, model, site, capsys):
+    df, soil, iom, nsteps = site
+    start = ModelRunner.initialize_pools(iom)
+    runner.run_to_equilibrium(model, start, df, soil, verbose=False)
+    
+    results = []
+    for verbose in (False, True):
+        pools = ModelRunner.initialize_pools(iom)
+        pools.state[:] = start.state
+        year_results, month_results = runner.run_simulation(
+            model, pools, df, soil, 12, nsteps, verbose=verbose,
+            print_interval=10)
+        results.append((year_results, month_results, pools.state))
+    
+    # The verbose run restarts the kernel every year, which only rounds
+    # the total radiocarbon age differently
+    for quiet, verbose in zip(*results):
+        np.testing.assert_allclose(verbose, quiet, rtol=1e-12)
+    
+    lines = capsys.readouterr().out.splitlines()
+    assert lines == [f"Year {int(row[0])}: SOC={row[7]:.4f} t C/ha"
+                     for row in year_results[::10]]
+
+
+def test_default_print_interval_prints_every_hundredth_year(runner, model,
+                                                            site, capsys):
+    df, soil, iom, nsteps = site
+    pools = ModelRunner.initialize_pools(iom)
+    
+    year_results, _ = runner.run_simulation(model, pools, df, soil, 12,
+                                            nsteps)
+    
+    lines = capsys.readouterr().out.splitlines()
+    assert lines == [f"Year {int(row[0])}: SOC={row[7]:.4f} t C/ha"
+                     for row in year_results[::100]]
+
+
+@pytest.mark.parametrize('print_interval', [0, -1])
+def test_print_interval_below_one_is_rejected(runner, model, site,
+                                              print_interval):
+    df, soil, iom, nsteps = site
+    pools = ModelRunner.initialize_pools(iom)
+    
+    with pytest.raises(ValueError, match="print_interval"):
+        runner.run_simulation(model, pools, df, soil, 12, nsteps,
+                              print_interval=print_interval)